@@ -4,9 +4,10 @@ from django.db import IntegrityError, models
 from django.db import transaction
 from django.forms import ValidationError
 from django.dispatch import receiver
-from django.db.models.signals import post_save, pre_delete
+from django.db.models.signals import post_save, pre_delete, post_delete, m2m_changed
 from django.db.models import Sum
 from users.models import User
+from api.utils import invalidate_sumulas_cache
 import string
 import secrets
 TOKEN_LENGTH = 9
@@ -125,6 +126,11 @@ class Event (models.Model):
         """Retorna se o evento está ativo ou não."""
         return self.active
 
+    def is_admin_user(self, user) -> bool:
+        """Retorna se o usuário é o administrador do evento.
+        admin_email é copiado do email do usuário que criou o evento, então a comparação é exata."""
+        return bool(self.admin_email) and user.email == self.admin_email
+
     def save(self, *args, **kwargs) -> None:
         """Sobrescreve o método save para gerar um token caso não exista."""
         if not self.join_token:
@@ -405,3 +411,20 @@ class Results(models.Model):
         for player in players:
             self.imortals.add(player)
         self.save()
+
+
+# Invalida as sumulas em cache do evento quando algo que elas exibem muda
+@receiver([post_save, post_delete], sender=SumulaImortal)
+@receiver([post_save, post_delete], sender=SumulaClassificatoria)
+@receiver([post_save, post_delete], sender=PlayerScore)
+@receiver([post_save, post_delete], sender=Player)
+@receiver([post_save, post_delete], sender=Staff)
+def invalidate_sumulas_cache_on_change(sender, instance, **kwargs):
+    invalidate_sumulas_cache(instance.event_id)
+
+
+@receiver(m2m_changed, sender=SumulaImortal.referee.through)
+@receiver(m2m_changed, sender=SumulaClassificatoria.referee.through)
+def invalidate_sumulas_cache_on_referee_change(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_sumulas_cache(instance.event_id)
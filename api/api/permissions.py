@@ -1,4 +1,5 @@
-from guardian.shortcuts import assign_perm
+from guardian.core import ObjectPermissionChecker
+from guardian.utils import get_user_obj_perms_model
 from django.contrib.auth.models import Permission, Group
 from django.contrib.contenttypes.models import ContentType
 from typing import Type
@@ -7,6 +8,7 @@ from django.db.models import Q
 from api.models import Event
 from users.models import User
 from typing import Optional
+from rest_framework.request import Request
 from django.db.models import QuerySet
 
 
@@ -16,10 +18,34 @@ def assign_permissions(user: User, group: Group, event: Event) -> None:
         user (User): Usuário ao qual as permissões serão atribuídas
         group (Group): Grupo do usuário
         event (Event): Evento ao qual as permissões serão atribuídas
+    As permissões são gravadas em um único INSERT; as que o usuário já possui são ignoradas.
     """
     permissions = filter_permissions(group)
-    for permission in permissions:
-        assign_perm(permission, user, event)
+    model = get_user_obj_perms_model(event)
+    content_type = get_content_type(Event)
+    model.objects.bulk_create([
+        model(user=user, permission=permission,
+              content_type=content_type, object_pk=str(event.pk))
+        for permission in permissions
+    ], ignore_conflicts=True)
+
+
+def has_event_perm(request: Request, perm: str, obj: Model) -> bool:
+    """ Verifica se o usuário da requisição possui a permissão no objeto.
+    Args:
+        request (Request): Requisição atual
+        perm (str): Permissão no formato 'app_label.codename'
+        obj (Model): Objeto ao qual a permissão se refere
+    O ObjectPermissionChecker é criado uma única vez por requisição, então as permissões de
+    um objeto são buscadas no banco apenas na primeira verificação.
+    """
+    if not request.user.is_authenticated:
+        return request.user.has_perm(perm, obj)
+    checker = getattr(request, '_permission_checker', None)
+    if checker is None:
+        checker = ObjectPermissionChecker(request.user)
+        request._permission_checker = checker
+    return checker.has_perm(perm, obj)
 
 
 def filter_permissions(group: Group) -> Optional[QuerySet[Permission]]:
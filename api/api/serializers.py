@@ -1,52 +1,82 @@
+import copy
+import threading
+from django.db.models import Prefetch, QuerySet, prefetch_related_objects
 from rest_framework.serializers import ModelSerializer
 from rest_framework import serializers
 from api.models import SumulaClassificatoria, Token, Event, Sumula, PlayerScore, Player, Staff, SumulaImortal, Results
 from users.models import User
 
 
-class UserSerializer(ModelSerializer):
+class CachedFieldsModelSerializer(ModelSerializer):
+    """ ModelSerializer que monta o mapa de campos apenas uma vez por classe.
+    A introspecção do model (get_field_info/build_field) é feita na primeira instância
+    e as seguintes recebem cópias dos campos em cache, da mesma forma que o DRF
+    já faz com os campos declarados.
+    """
+    _fields_cache = {}
+    _fields_cache_lock = threading.Lock()
+
+    def get_fields(self):
+        cls = self.__class__
+        fields = self._fields_cache.get(cls)
+        if fields is None:
+            with self._fields_cache_lock:
+                fields = self._fields_cache.get(cls)
+                if fields is None:
+                    fields = super().get_fields()
+                    self._fields_cache[cls] = fields
+        return copy.deepcopy(fields)
+
+
+class UserSerializer(CachedFieldsModelSerializer):
     """ Serializer for the User model.
     fields: first_name, last_name, id
     """
     class Meta:
         model = User
         fields = ['id', 'first_name', 'last_name', 'email']
+        read_only_fields = fields
 
 
-class PlayerResultsSerializer(ModelSerializer):
+class PlayerResultsSerializer(CachedFieldsModelSerializer):
     """ Serializer for the Player model. Returns only the necessary fields for results.
     fields: 'id', 'total_score', 'full_name', 'social_name'
     """
     class Meta:
         model = Player
         fields = ['id', 'total_score', 'full_name', 'social_name']
+        read_only_fields = fields
 
 
-class PlayerSerializer(ModelSerializer):
+class PlayerSerializer(CachedFieldsModelSerializer):
     class Meta:
         model = Player
         fields = ['id', 'full_name', 'social_name', 'is_imortal', 'is_present']
+        read_only_fields = fields
 
 
-class PlayerForRoundRobinSerializer(ModelSerializer):
+class PlayerForRoundRobinSerializer(CachedFieldsModelSerializer):
     class Meta:
         model = Player
         fields = ['id', 'full_name', 'social_name']
+        read_only_fields = fields
 
 
-class TokenSerializer(ModelSerializer):
+class TokenSerializer(CachedFieldsModelSerializer):
     class Meta:
         model = Token
         fields = ['token_code']
+        read_only_fields = fields
 
 
-class EventSerializer(ModelSerializer):
+class EventSerializer(CachedFieldsModelSerializer):
     """ Serializer for the Event model.
     fields: 'id', 'name','active'
     """
     class Meta:
         model = Event
         fields = ['id', 'name', 'active']
+        read_only_fields = fields
 
 
 class UserEventsSerializer(serializers.Serializer):
@@ -63,23 +93,33 @@ class UserEventsSerializer(serializers.Serializer):
         return EventSerializer(obj['event']).data
 
 
-class PlayerScoreSerializer(ModelSerializer):
-    player = PlayerSerializer()
+class PlayerScoreSerializer(CachedFieldsModelSerializer):
+    player = PlayerSerializer(read_only=True)
 
     class Meta:
         model = PlayerScore
         fields = ['id', 'points', 'rounds_number', 'player']
+        read_only_fields = fields
+
+    @classmethod
+    def prefetch_queryset(cls, sumula_field: str) -> QuerySet[PlayerScore]:
+        """Pontuações com o jogador no mesmo JOIN, carregando apenas as colunas serializadas.
+        sumula_field é a FK usada pelo prefetch para ligar a pontuação à sua sumula."""
+        return PlayerScore.objects.select_related('player').only(
+            'id', 'points', 'rounds_number', sumula_field, 'player',
+            *(f'player__{field}' for field in PlayerSerializer.Meta.fields))
 
 
-class PlayerScoreForRoundRobinSerializer(ModelSerializer):
-    player = PlayerForRoundRobinSerializer()
+class PlayerScoreForRoundRobinSerializer(CachedFieldsModelSerializer):
+    player = PlayerForRoundRobinSerializer(read_only=True)
 
     class Meta:
         model = PlayerScore
         fields = ['id', 'rounds_number', 'player']
+        read_only_fields = fields
 
 
-class StaffSerializer(ModelSerializer):
+class StaffSerializer(CachedFieldsModelSerializer):
     """ Serializer for the Staff model.
     fields: id, full_name, event, registration_email
     """
@@ -87,34 +127,69 @@ class StaffSerializer(ModelSerializer):
     class Meta:
         model = Staff
         fields = ['id', 'full_name', 'registration_email', 'is_manager']
+        read_only_fields = fields
 
 
-class SumulaClassificatoriaSerializer(ModelSerializer):
+class SumulaPrefetchMixin:
+    """ Relações lidas pelos serializers de sumula, carregadas em consultas únicas
+    para evitar uma consulta extra por sumula (e por pontuação) durante a serialização.
+    scores_sumula_field: FK de PlayerScore que aponta para o tipo de sumula do serializer.
+    """
+    scores_sumula_field: str
+
+    @classmethod
+    def get_prefetch_lookups(cls) -> tuple:
+        return (
+            Prefetch('referee', queryset=Staff.objects.only(
+                *StaffSerializer.Meta.fields)),
+            Prefetch('scores', queryset=PlayerScoreSerializer.prefetch_queryset(cls.scores_sumula_field)))
+
+    @classmethod
+    def prefetch_queryset(cls, queryset: QuerySet[Sumula]) -> QuerySet[Sumula]:
+        """Aplica os prefetches dos árbitros e das pontuações (com seus jogadores) a um queryset,
+        carregando da sumula apenas as colunas que o serializer exibe."""
+        columns = [field for field in cls.Meta.fields
+                   if field not in cls._declared_fields]
+        return queryset.only(*columns).prefetch_related(*cls.get_prefetch_lookups())
+
+    @classmethod
+    def prefetch_instances(cls, sumulas: list[Sumula]) -> None:
+        """Aplica os mesmos prefetches a sumulas já carregadas, como uma recém-criada."""
+        prefetch_related_objects(sumulas, *cls.get_prefetch_lookups())
+
+
+class SumulaClassificatoriaSerializer(SumulaPrefetchMixin, CachedFieldsModelSerializer):
     """ Serializer for the SumulaClassificatoria model.
     fields: id, active, description, referee, name, players_score
     """
     players_score = PlayerScoreSerializer(
-        source='scores', many=True)
-    referee = StaffSerializer(many=True)
+        source='scores', many=True, read_only=True)
+    referee = StaffSerializer(many=True, read_only=True)
+
+    scores_sumula_field = 'sumula_classificatoria'
 
     class Meta:
         model = SumulaClassificatoria
         fields = ['id', 'active', 'name',
                   'description', 'referee',  'players_score', 'rounds']
+        read_only_fields = fields
 
 
-class SumulaImortalSerializer(ModelSerializer):
+class SumulaImortalSerializer(SumulaPrefetchMixin, CachedFieldsModelSerializer):
     """ Serializer for the Sumula model.
     fields: id, active, description, referee, name, players_score
     """
     players_score = PlayerScoreSerializer(
-        source='scores', many=True)
-    referee = StaffSerializer(many=True)
+        source='scores', many=True, read_only=True)
+    referee = StaffSerializer(many=True, read_only=True)
+
+    scores_sumula_field = 'sumula_imortal'
 
     class Meta:
         model = SumulaImortal
         fields = ['id', 'active', 'name',
                   'description', 'referee',  'players_score', 'rounds']
+        read_only_fields = fields
 
 
 class SumulaSerializer(serializers.Serializer):
@@ -134,38 +209,47 @@ class SumulaSerializer(serializers.Serializer):
         fields = ['sumulas_classificatoria', 'sumulas_imortal']
 
 
-class PlayerScoreForPlayerSerializer(ModelSerializer):
-    player = PlayerSerializer()
+class PlayerScoreForPlayerSerializer(CachedFieldsModelSerializer):
+    player = PlayerSerializer(read_only=True)
 
     class Meta:
         model = PlayerScore
         fields = ['player']
+        read_only_fields = fields
 
 
-class SumulaClassificatoriaForPlayerSerializer(ModelSerializer):
+class SumulaClassificatoriaForPlayerSerializer(SumulaPrefetchMixin, CachedFieldsModelSerializer):
     """ Serializer for the Sumula model.
     fields: id, active, referee, name, players_score
     """
-    referee = StaffSerializer(many=True)
-    players = PlayerScoreForPlayerSerializer(source='scores', many=True)
+    referee = StaffSerializer(many=True, read_only=True)
+    players = PlayerScoreForPlayerSerializer(
+        source='scores', many=True, read_only=True)
+
+    scores_sumula_field = 'sumula_classificatoria'
 
     class Meta:
         model = SumulaClassificatoria
         fields = ['id', 'active', 'name', 'description',
                   'referee', 'players', 'rounds']
+        read_only_fields = fields
 
 
-class SumulaImortalForPlayerSerializer(ModelSerializer):
+class SumulaImortalForPlayerSerializer(SumulaPrefetchMixin, CachedFieldsModelSerializer):
     """ Serializer for the Sumula model.
     fields: id, active, referee, name, players_score
     """
-    referee = StaffSerializer(many=True)
-    players = PlayerScoreForPlayerSerializer(source='scores', many=True)
+    referee = StaffSerializer(many=True, read_only=True)
+    players = PlayerScoreForPlayerSerializer(
+        source='scores', many=True, read_only=True)
+
+    scores_sumula_field = 'sumula_imortal'
 
     class Meta:
         model = SumulaImortal
         fields = ['id', 'active', 'name', 'description',
                   'referee', 'players', 'rounds']
+        read_only_fields = fields
 
 
 class SumulaForPlayerSerializer(serializers.Serializer):
@@ -189,24 +273,26 @@ class UploadFileSerializer(serializers.Serializer):
     file = serializers.FileField()
 
 
-class StaffLoginSerializer(ModelSerializer):
-    event = EventSerializer()
+class StaffLoginSerializer(CachedFieldsModelSerializer):
+    event = EventSerializer(read_only=True)
 
     class Meta:
         model = Staff
         fields = ['id', 'full_name', 'is_manager', 'event']
+        read_only_fields = fields
 
 
-class PlayerLoginSerializer(ModelSerializer):
-    event = EventSerializer()
+class PlayerLoginSerializer(CachedFieldsModelSerializer):
+    event = EventSerializer(read_only=True)
 
     class Meta:
         model = Player
         fields = ['id', 'full_name', 'social_name',
                   'is_imortal', 'is_present', 'event']
+        read_only_fields = fields
 
 
-class ResultsSerializer(ModelSerializer):
+class ResultsSerializer(CachedFieldsModelSerializer):
     top4 = serializers.SerializerMethodField()
     imortals = serializers.SerializerMethodField()
     ambassor = serializers.SerializerMethodField()
@@ -215,6 +301,7 @@ class ResultsSerializer(ModelSerializer):
     class Meta:
         model = Results
         fields = ['id', 'top4', 'imortals', 'ambassor', 'paladin']
+        read_only_fields = fields
 
     def get_top4(self, obj):
         if not obj.event.is_final_results_published:
@@ -412,6 +412,47 @@ manual_parameter_event_id = [openapi.Parameter(
 array_of_sumulas_response_schema = openapi.Schema(
     title='Sumulas', type=openapi.TYPE_ARRAY, items=indivual_sumulas_response_schema)
 
+sumula_post_players_schema = openapi.Schema(
+    type=openapi.TYPE_ARRAY,
+    title='Players',
+    items=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            'id': openapi.Schema(type=openapi.TYPE_INTEGER, description='ID do jogador'),
+            'name': openapi.Schema(type=openapi.TYPE_STRING, description='Nome do jogador'),
+        }
+    ),
+    description='Lista de jogadores',
+)
+
+sumula_post_referees_schema = openapi.Schema(
+    type=openapi.TYPE_ARRAY, title='Staffs',
+    items=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={'id': openapi.Schema(type=openapi.TYPE_INTEGER, description='ID do Staff')}),
+    description='Lista de objetos Staff')
+
+sumula_classificatoria_api_post_schema = openapi.Schema(
+    title='Sumula',
+    type=openapi.TYPE_OBJECT,
+    properties={
+        'name': openapi.Schema(type=openapi.TYPE_STRING, description='Nome da sumula'),
+        'players': sumula_post_players_schema,
+        'referees': sumula_post_referees_schema,
+    },
+    required=['name', 'players'],
+)
+
+sumula_imortal_api_post_schema = openapi.Schema(
+    title='Sumula',
+    type=openapi.TYPE_OBJECT,
+    properties={
+        'players': sumula_post_players_schema,
+        'referees': sumula_post_referees_schema,
+    },
+    required=['players', 'referees'],
+)
+
 
 class Errors():
 
@@ -12,7 +12,6 @@ class TokenTest(TestCase):
 
     def setUp(self) -> None:
         self.token = Token.objects.create()
-        self.token.save()
 
     def test_generate_token(self):
         """Testa a geração de um token"""
@@ -77,7 +76,6 @@ class TokenTest(TestCase):
 class EventTest(TestCase):
     def setUp(self):
         self.token = Token.objects.create()
-        self.token.save()
 
     def test_create_event(self):
         """Testa a criação de um evento"""
@@ -130,6 +128,16 @@ class EventTest(TestCase):
         event = Event.objects.create(name='Evento 1', token=self.token)
         self.assertEqual(event.__token__(), self.token.token_code)
 
+    def test_event_is_admin_user(self):
+        """Testa a verificação do administrador de um evento"""
+        event = Event.objects.create(
+            name='Evento 1', token=self.token, admin_email='admin@gmail.com')
+        self.assertTrue(event.is_admin_user(User(email='admin@gmail.com')))
+        self.assertFalse(event.is_admin_user(User(email='Admin@Gmail.com')))
+        self.assertFalse(event.is_admin_user(User(email='outro@gmail.com')))
+        event.admin_email = None
+        self.assertFalse(event.is_admin_user(User(email='admin@gmail.com')))
+
     def tearDown(self) -> None:
         self.token.delete()
         if Event.objects.all().count() > 0:
@@ -1,7 +1,12 @@
 from django.contrib.auth.models import Permission, Group
 from users.models import User
 from ..models import Event, Token
-from ..permissions import filter_permissions, assign_permissions
+from ..permissions import filter_permissions, assign_permissions, has_event_perm
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
 import uuid
 from django.db.models import QuerySet
 from django.test import TestCase
@@ -70,6 +75,28 @@ class AddPermissionsTestCase(TestCase):
         permissions = filter_permissions(invalid_group)
         self.assertIsNone(permissions)
 
+    def test_has_event_perm(self):
+        """Testa a verificação de permissões com cache por requisição."""
+        assign_permissions(self.user, self.group_staff_member, self.event)
+        request = Request(APIRequestFactory().get('/'))
+        request.user = self.user
+        with CaptureQueriesContext(connection) as first_check:
+            self.assertTrue(has_event_perm(
+                request, 'api.view_sumula_event', self.event))
+        with CaptureQueriesContext(connection) as second_check:
+            self.assertTrue(has_event_perm(
+                request, 'api.change_sumula_event', self.event))
+            self.assertFalse(has_event_perm(
+                request, 'api.delete_sumula_event', self.event))
+        self.assertGreater(len(first_check), 0)
+        self.assertEqual(len(second_check), 0)
+
+    def test_has_event_perm_anonymous_user(self):
+        request = Request(APIRequestFactory().get('/'))
+        request.user = AnonymousUser()
+        self.assertFalse(has_event_perm(
+            request, 'api.view_sumula_event', self.event))
+
     def verify_permissions(self, user, obj, expected_permissions):
         for perm in expected_permissions:
             self.assertTrue(user.has_perm(perm, obj))
@@ -2,10 +2,12 @@
 import random
 from rest_framework.test import APITestCase, APIClient
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
-from api.models import Results, SumulaImortal, SumulaClassificatoria, Event,  Token, Player
+from api.models import Results, Event,  Token, Player
 from users.models import User
-import uuid
+import secrets
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth.models import Group
 from ..permissions import assign_permissions
@@ -13,85 +15,93 @@ from guardian.shortcuts import remove_perm, get_perms
 from decouple import config
 XLSX_PATH = config("XLSX_FILE_PATH")
 CSV_PATH = config("CSV_FILE_PATH")
+_NAMES = ('João', 'José', 'Pedro', 'Paulo', 'Lucas', 'Mário', 'Luiz')
 
 
 class PlayersViewTest(APITestCase):
-    def create_unique_email(self):
-        return f'{uuid.uuid4()}@gmail.com'
+    @classmethod
+    def create_unique_email(cls):
+        return f'{secrets.token_hex(8)}@gmail.com'
 
-    def create_unique_username(self):
-        return f'user_{uuid.uuid4().hex[:10]}'
+    @classmethod
+    def create_unique_username(cls):
+        return f'user_{secrets.token_hex(5)}'
 
     def remove_permissions(self, user, event):
         perms = get_perms(user, event)
         for perm in perms:
             remove_perm(perm, user, event)
 
-    def generate_random_name(self):
-        names = ['João', 'José', 'Pedro', 'Paulo', 'Lucas', 'Mário', 'Luiz']
-        return names[random.randint(0, 6)]
-
-    def setupUser(self):
-        self.admin = User.objects.create(
-            username='admin', email=f'{uuid.uuid4()}@gmail.com', first_name='Admin', last_name='Admin')
-        self.user_staff_manager = User.objects.create(
-            username='staff_manager', email=f'{uuid.uuid4()}@gmail.com', first_name='Staff', last_name='Manager')
-        self.user_staff_member = User.objects.create(
-            username='staff_member', email=f'{uuid.uuid4()}@gmail.com', first_name='Staff', last_name='Member')
-        self.user_player1 = User.objects.create(
-            username=self.create_unique_username(), email=f'{uuid.uuid4()}@gmail.com', first_name=self.generate_random_name(), last_name=self.generate_random_name())
-        self.user_player2 = User.objects.create(
-            username=self.create_unique_username(), email=self.create_unique_email(), first_name=self.generate_random_name(), last_name=self.generate_random_name())
-
-        self.user_player3 = User.objects.create(
-            username=self.create_unique_username(), email=self.create_unique_email(), first_name=self.generate_random_name(), last_name=self.generate_random_name())
-
-        self.user_player4 = User.objects.create(
-            username=self.create_unique_username(), email=self.create_unique_email(), first_name=self.generate_random_name(), last_name=self.generate_random_name())
-
-    def setUpEvent(self):
-        self.token = Token.objects.create()
-        self.event = Event.objects.create(name='Evento 1', token=self.token)
-
-    def setUpPlayers(self):
-        self.player1 = Player.objects.create(
-            user=self.user_player1, event=self.event, registration_email=self.create_unique_email())
-        self.player2 = Player.objects.create(
-            user=self.user_player2, event=self.event, registration_email=self.create_unique_email())
-        self.player3 = Player.objects.create(
-            user=self.user_player3, event=self.event, registration_email=self.create_unique_email())
-        self.player4 = Player.objects.create(
-            user=self.user_player4, event=self.event, registration_email=self.create_unique_email())
-
-    def setUpGroup(self):
-        self.group_app_admin = Group.objects.create(name='app_admin')
-        self.group_event_admin = Group.objects.create(name='event_admin')
-        self.group_staff_manager = Group.objects.create(name='staff_manager')
-        self.group_staff_member = Group.objects.create(name='staff_member')
-        self.group_player = Group.objects.create(name='player')
-
-    def setUpPermissions(self):
-        assign_permissions(self.user_staff_manager,
-                           self.group_staff_manager, self.event)
-        assign_permissions(self.user_staff_member,
-                           self.group_staff_member, self.event)
-        assign_permissions(self.admin,
-                           self.group_event_admin, self.event)
-        assign_permissions(self.user_player1, self.group_player, self.event)
+    @classmethod
+    def generate_random_name(cls):
+        return random.choice(_NAMES)
+
+    @classmethod
+    def setupUser(cls):
+        users = User.objects.bulk_create([
+            User(username='admin', email=f'{secrets.token_hex(8)}@gmail.com',
+                 first_name='Admin', last_name='Admin'),
+            User(username='staff_manager', email=f'{secrets.token_hex(8)}@gmail.com',
+                 first_name='Staff', last_name='Manager'),
+            User(username='staff_member', email=f'{secrets.token_hex(8)}@gmail.com',
+                 first_name='Staff', last_name='Member'),
+            *[User(username=cls.create_unique_username(), email=cls.create_unique_email(),
+                   first_name=cls.generate_random_name(), last_name=cls.generate_random_name())
+              for _ in range(4)],
+        ])
+        (cls.admin, cls.user_staff_manager, cls.user_staff_member, cls.user_player1,
+         cls.user_player2, cls.user_player3, cls.user_player4) = users
+
+    @classmethod
+    def setUpEvent(cls):
+        cls.token = Token.objects.create()
+        cls.event = Event.objects.create(name='Evento 1', token=cls.token)
+
+    @classmethod
+    def setUpPlayers(cls):
+        cls.player1, cls.player2, cls.player3, cls.player4 = Player.objects.bulk_create([
+            Player(user=user, event=cls.event,
+                   registration_email=cls.create_unique_email())
+            for user in (cls.user_player1, cls.user_player2, cls.user_player3, cls.user_player4)
+        ])
+
+    @classmethod
+    def setUpGroup(cls):
+        cls.group_app_admin = Group.objects.create(name='app_admin')
+        cls.group_event_admin = Group.objects.create(name='event_admin')
+        cls.group_staff_manager = Group.objects.create(name='staff_manager')
+        cls.group_staff_member = Group.objects.create(name='staff_member')
+        cls.group_player = Group.objects.create(name='player')
+
+    @classmethod
+    def setUpPermissions(cls):
+        assign_permissions(cls.user_staff_manager,
+                           cls.group_staff_manager, cls.event)
+        assign_permissions(cls.user_staff_member,
+                           cls.group_staff_member, cls.event)
+        assign_permissions(cls.admin,
+                           cls.group_event_admin, cls.event)
+        assign_permissions(cls.user_player1, cls.group_player, cls.event)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.setUpEvent()
+        cls.setupUser()
+        cls.setUpPlayers()
+        cls.setUpGroup()
+        cls.setUpPermissions()
+        cls.base_url = reverse('api:players')
+        cls.url_get = f"{cls.base_url}?event_id={cls.event.id}"
+        cls.url_post = cls.base_url
 
     def setUp(self):
-        self.setUpEvent()
-        self.setupUser()
-        self.setUpPlayers()
-        self.setUpGroup()
-        self.setUpPermissions()
         self.client = APIClient()
-        self.url_get = f"{reverse('api:players')}?event_id={self.event.id}"
-        self.url_post = reverse('api:players')
 
     def test_get_all_players(self):
         self.client.force_authenticate(user=self.admin)
-        response = self.client.get(self.url_get)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url_get)
+        self.assertLessEqual(len(ctx.captured_queries), 4)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 4)
 
@@ -101,7 +111,7 @@ class PlayersViewTest(APITestCase):
 
     def test_get_all_players_without_event_id(self):
         self.client.force_authenticate(user=self.admin)
-        url = reverse('api:players')
+        url = self.base_url
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         # self.assertEqual(response.data['errors'], 'event_id is required')
@@ -114,14 +124,14 @@ class PlayersViewTest(APITestCase):
 
     def test_get_all_players_with_invalid_event_id(self):
         self.client.force_authenticate(user=self.admin)
-        url = f"{reverse('api:players')}?event_id=100"
+        url = f"{self.base_url}?event_id=100"
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_get_all_players_withouth_any_player(self):
         self.client.force_authenticate(user=self.admin)
         Player.objects.all().delete()
-        url = f"{reverse('api:players')}?event_id={self.event.id}"
+        url = self.url_get
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
@@ -174,71 +184,72 @@ class PlayersViewTest(APITestCase):
         response = self.client.post(self.url_post, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
-    def tearDown(self):
-        User.objects.all().delete()
-        SumulaImortal.objects.all().delete()
-        SumulaClassificatoria.objects.all().delete()
-        Event.objects.all().delete()
-        Token.objects.all().delete()
-        Player.objects.all().delete()
-        Group.objects.all().delete()
-        self.data = None
-
 
 class GetPlayerResultsViewTest(APITestCase):
-    def create_unique_email(self):
-        return f'{uuid.uuid4()}@gmail.com'
-
-    def create_unique_username(self):
-        return f'user_{uuid.uuid4().hex[:10]}'
-
-    def generate_random_name(self):
-        names = ['João', 'José', 'Pedro', 'Paulo', 'Lucas', 'Mário', 'Luiz']
-        return names[random.randint(0, 6)]
-
-    def setupUser(self):
-        self.user = User.objects.create(
-            username=self.create_unique_username(), email=f'{uuid.uuid4()}@gmail.com',
-            first_name=self.generate_random_name(), last_name=self.generate_random_name())
-        self.user_staff_manager = User.objects.create(
-            username='staff_manager', email=f'{uuid.uuid4()}@gmail.com')
-        self.user_staff_member = User.objects.create(
-            username='staff_member', email=f'{uuid.uuid4()}@gmail.com')
-        self.admin = User.objects.create(
-            username='admin', email=f'{uuid.uuid4()}@gmail.com')
-
-    def setUpEvent(self):
-        self.token = Token.objects.create()
-        self.event = Event.objects.create(
-            name='Evento 1', token=self.token, is_imortal_results_published=True)
-
-    def setUpPlayers(self):
-        self.player = Player.objects.create(
-            user=self.user, event=self.event, registration_email=self.create_unique_email())
-
-    def setUpGroup(self):
-        self.group_app_admin = Group.objects.create(name='app_admin')
-        self.group_event_admin = Group.objects.create(name='event_admin')
-        self.group_staff_manager = Group.objects.create(name='staff_manager')
-        self.group_staff_member = Group.objects.create(name='staff_member')
-        self.group_player = Group.objects.create(name='player')
-
-    def setUpPermissions(self):
-        assign_permissions(self.user_staff_manager,
-                           self.group_staff_manager, self.event)
-        assign_permissions(self.user_staff_member,
-                           self.group_staff_member, self.event)
-        assign_permissions(self.admin,
-                           self.group_event_admin, self.event)
-        assign_permissions(self.user, self.group_player, self.event)
+    @classmethod
+    def create_unique_email(cls):
+        return f'{secrets.token_hex(8)}@gmail.com'
+
+    @classmethod
+    def create_unique_username(cls):
+        return f'user_{secrets.token_hex(5)}'
+
+    @classmethod
+    def generate_random_name(cls):
+        return random.choice(_NAMES)
+
+    @classmethod
+    def setupUser(cls):
+        cls.user = User.objects.create(
+            username=cls.create_unique_username(), email=f'{secrets.token_hex(8)}@gmail.com',
+            first_name=cls.generate_random_name(), last_name=cls.generate_random_name())
+        cls.user_staff_manager = User.objects.create(
+            username='staff_manager', email=f'{secrets.token_hex(8)}@gmail.com')
+        cls.user_staff_member = User.objects.create(
+            username='staff_member', email=f'{secrets.token_hex(8)}@gmail.com')
+        cls.admin = User.objects.create(
+            username='admin', email=f'{secrets.token_hex(8)}@gmail.com')
+
+    @classmethod
+    def setUpEvent(cls):
+        cls.token = Token.objects.create()
+        cls.event = Event.objects.create(
+            name='Evento 1', token=cls.token, is_imortal_results_published=True)
+
+    @classmethod
+    def setUpPlayers(cls):
+        cls.player = Player.objects.create(
+            user=cls.user, event=cls.event, registration_email=cls.create_unique_email())
+
+    @classmethod
+    def setUpGroup(cls):
+        cls.group_app_admin = Group.objects.create(name='app_admin')
+        cls.group_event_admin = Group.objects.create(name='event_admin')
+        cls.group_staff_manager = Group.objects.create(name='staff_manager')
+        cls.group_staff_member = Group.objects.create(name='staff_member')
+        cls.group_player = Group.objects.create(name='player')
+
+    @classmethod
+    def setUpPermissions(cls):
+        assign_permissions(cls.user_staff_manager,
+                           cls.group_staff_manager, cls.event)
+        assign_permissions(cls.user_staff_member,
+                           cls.group_staff_member, cls.event)
+        assign_permissions(cls.admin,
+                           cls.group_event_admin, cls.event)
+        assign_permissions(cls.user, cls.group_player, cls.event)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.setUpEvent()
+        cls.setupUser()
+        cls.setUpPlayers()
+        cls.setUpGroup()
+        cls.setUpPermissions()
+        cls.base_url = reverse('api:player')
+        cls.url = f"{cls.base_url}?event_id={cls.event.id}"
 
     def setUp(self):
-        self.setUpEvent()
-        self.setupUser()
-        self.setUpPlayers()
-        self.setUpGroup()
-        self.setUpPermissions()
-        self.url = f"{reverse('api:player')}?event_id={self.event.id}"
         self.client = APIClient()
 
     def remove_permissions(self, user, event):
@@ -259,7 +270,7 @@ class GetPlayerResultsViewTest(APITestCase):
 
     def test_get_player_without_event_id(self):
         self.client.force_authenticate(user=self.user)
-        url = f"{reverse('api:player')}?event_id="
+        url = f"{self.base_url}?event_id="
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(
@@ -267,7 +278,7 @@ class GetPlayerResultsViewTest(APITestCase):
 
     def test_get_player_with_invalid_event_id(self):
         self.client.force_authenticate(user=self.user)
-        url = f"{reverse('api:player')}?event_id=100"
+        url = f"{self.base_url}?event_id=100"
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(
@@ -280,7 +291,7 @@ class GetPlayerResultsViewTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
     def test_get_player_unauthenticated(self):
-        url = reverse('api:player')
+        url = self.base_url
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
@@ -300,31 +311,20 @@ class GetPlayerResultsViewTest(APITestCase):
         # self.assertEqual(
         #     response.data, 'Resultados não publicados!')
 
-    def tearDown(self):
-        User.objects.all().delete()
-        SumulaImortal.objects.all().delete()
-        SumulaClassificatoria.objects.all().delete()
-        Event.objects.all().delete()
-        Token.objects.all().delete()
-        Player.objects.all().delete()
-        Group.objects.all().delete()
-        self.client = None
-
 
 class AddPlayersViewTest(APITestCase):
     def create_unique_email(self):
-        return f'{uuid.uuid4()}@gmail.com'
+        return f'{secrets.token_hex(8)}@gmail.com'
 
     def create_unique_username(self):
-        return f'user_{uuid.uuid4().hex[:10]}'
+        return f'user_{secrets.token_hex(5)}'
 
     def generate_random_name(self):
-        names = ['João', 'José', 'Pedro', 'Paulo', 'Lucas', 'Mário', 'Luiz']
-        return names[random.randint(0, 6)]
+        return random.choice(_NAMES)
 
     def setupUser(self):
         self.admin = User.objects.create(
-            username='admin', email=f'{uuid.uuid4()}@gmail.com', first_name='Admin', last_name='Admin')
+            username='admin', email=f'{secrets.token_hex(8)}@gmail.com', first_name='Admin', last_name='Admin')
 
     def setUpEvent(self):
         self.token = Token.objects.create()
@@ -419,20 +419,15 @@ class AddPlayersViewTest(APITestCase):
             response.data, {'errors': "['Evento não encontrado!']"})
 
     def tearDown(self):
-        User.objects.all().delete()
-        Event.objects.all().delete()
-        Player.objects.all().delete()
-        Group.objects.all().delete()
-        self.data = None
         self.excel_file.close()
 
 
 class PublishPlayersResultsViewTestCase(APITestCase):
     def create_unique_email(self):
-        return f'{uuid.uuid4()}@gmail.com'
+        return f'{secrets.token_hex(8)}@gmail.com'
 
     def create_unique_username(self):
-        return f'user_{uuid.uuid4().hex[:10]}'
+        return f'user_{secrets.token_hex(5)}'
 
     def remove_permissions(self, user, event):
         perms = get_perms(user, event)
@@ -506,14 +501,6 @@ class PublishPlayersResultsViewTestCase(APITestCase):
         self.event.refresh_from_db()
         self.assertEqual(self.event.is_final_results_published, False)
 
-    def tearDown(self):
-        User.objects.all().delete()
-        Event.objects.all().delete()
-        Token.objects.all().delete()
-        Player.objects.all().delete()
-        Group.objects.all().delete()
-        self.data = None
-
 
 # class Top3ImortalPlayersViewTest(APITestCase):
 #     def create_unique_email(self):
@@ -608,10 +595,10 @@ class PublishPlayersResultsViewTestCase(APITestCase):
 class AddSinglePlayerViewTest(APITestCase):
 
     def create_unique_email(self):
-        return f'{uuid.uuid4()}@gmail.com'
+        return f'{secrets.token_hex(8)}@gmail.com'
 
     def create_unique_username(self):
-        return f'user_{uuid.uuid4().hex[:10]}'
+        return f'user_{secrets.token_hex(5)}'
 
     def setUpUser(self):
         self.admin = User.objects.create(
@@ -1,12 +1,17 @@
 from django.forms import ValidationError
 from rest_framework.test import APITestCase
 from django.urls import reverse
+from django.db import connection
+from django.db.models import Prefetch
+from django.test.utils import CaptureQueriesContext
 from django.utils.crypto import get_random_string
 from rest_framework import status
 from rest_framework.test import APIClient
 from api.models import SumulaImortal, SumulaClassificatoria, Event, PlayerScore, Token, Player, Staff
 from users.models import User
-import uuid
+import secrets
+from unittest.mock import patch
+from django.core.cache import cache
 from ..utils import get_permissions, get_content_type
 from ..permissions import assign_permissions, filter_permissions
 from ..serializers import SumulaForPlayerSerializer, SumulaImortalForPlayerSerializer, SumulaClassificatoriaForPlayerSerializer
@@ -15,74 +20,89 @@ from guardian.shortcuts import remove_perm, assign_perm, get_perms
 
 
 class BaseSumulaViewTest(APITestCase):
-    def create_unique_email(self):
-        return f'{uuid.uuid4()}@gmail.com'
-
-    def create_unique_username(self):
-        return f'user_{uuid.uuid4().hex[:10]}'
-
-    def setupUser(self):
-        self.user_staff_manager = User.objects.create(
-            username=self.create_unique_username(), email=f'{uuid.uuid4()}@gmail.com', first_name='Manager', last_name='Staff')
-
-        self.user_staff_member = User.objects.create(
-            username=self.create_unique_username(), email=self.create_unique_email(), first_name='Member', last_name='Staff')
-
-        self.user_app_admin = User.objects.create(
-            username=self.create_unique_username(), email=self.create_unique_email(), first_name='Admin', last_name='App')
-        self.user_player1 = User.objects.create(
-            username=self.create_unique_username(), email=self.create_unique_email(), first_name='Player1', last_name='User')
-        self.user_player2 = User.objects.create(
-            username=self.create_unique_username(), email=self.create_unique_email(), first_name='Player2', last_name='User')
-        self.user_player3 = User.objects.create(
-            username=self.create_unique_username(), email=self.create_unique_email())
-        self.user_player4 = User.objects.create(
-            username='player4', email=self.create_unique_email())
-
-    def setUpReferee(self, staff1: Staff, staff2: Staff, sumulas: list):
+    @classmethod
+    def create_unique_email(cls):
+        return f'{secrets.token_hex(8)}@gmail.com'
+
+    @classmethod
+    def create_unique_username(cls):
+        return f'user_{secrets.token_hex(5)}'
+
+    @classmethod
+    def setupUser(cls):
+        users = User.objects.bulk_create([
+            User(username=cls.create_unique_username(), email=f'{secrets.token_hex(8)}@gmail.com',
+                 first_name='Manager', last_name='Staff'),
+            User(username=cls.create_unique_username(), email=cls.create_unique_email(),
+                 first_name='Member', last_name='Staff'),
+            User(username=cls.create_unique_username(), email=cls.create_unique_email(),
+                 first_name='Admin', last_name='App'),
+            User(username=cls.create_unique_username(), email=cls.create_unique_email(),
+                 first_name='Player1', last_name='User'),
+            User(username=cls.create_unique_username(), email=cls.create_unique_email(),
+                 first_name='Player2', last_name='User'),
+            User(username=cls.create_unique_username(),
+                 email=cls.create_unique_email()),
+            User(username='player4', email=cls.create_unique_email()),
+        ])
+        (cls.user_staff_manager, cls.user_staff_member, cls.user_app_admin, cls.user_player1,
+         cls.user_player2, cls.user_player3, cls.user_player4) = users
+
+    @classmethod
+    def setUpReferee(cls, staff1: Staff, staff2: Staff, sumulas: list):
         for sumula in sumulas:
-            sumula.referee.add(staff1)
-            sumula.referee.add(staff2)
-
-    def setUpPlayers(self):
-        self.player = Player.objects.create(
-            user=self.user_player1, event=self.event, registration_email=self.create_unique_email())
-        self.player2 = Player.objects.create(
-            user=self.user_player2, event=self.event, registration_email=self.create_unique_email())
-        self.player3 = Player.objects.create(
-            user=self.user_player3, event=self.event, registration_email=self.create_unique_email())
-        self.player4 = Player.objects.create(
-            user=self.user_player4, event=self.event, registration_email=self.create_unique_email())
-
-    def setUpGroup(self):
-        self.group_app_admin = Group.objects.create(name='app_admin')
-        self.group_event_admin = Group.objects.create(name='event_admin')
-        self.group_staff_manager = Group.objects.create(name='staff_manager')
-        self.group_staff_member = Group.objects.create(name='staff_member')
-        self.group_player = Group.objects.create(name='player')
-
-    def setUpPermissions(self):
-        assign_permissions(self.user_staff_manager,
-                           self.group_staff_manager, self.event)
-        assign_permissions(self.user_staff_member,
-                           self.group_staff_member, self.event)
-        assign_permissions(self.user_app_admin,
-                           self.group_event_admin, self.event)
-
-    def setUpEvent(self):
-        self.token = Token.objects.create()
-        self.event = Event.objects.create(name='Evento 1', token=self.token)
+            sumula.referee.add(staff1, staff2)
+
+    @classmethod
+    def setUpPlayers(cls):
+        cls.player, cls.player2, cls.player3, cls.player4 = Player.objects.bulk_create([
+            Player(user=user, event=cls.event,
+                   registration_email=cls.create_unique_email())
+            for user in (cls.user_player1, cls.user_player2, cls.user_player3, cls.user_player4)
+        ])
+
+    @classmethod
+    def setUpGroup(cls):
+        cls.group_app_admin = Group.objects.create(name='app_admin')
+        cls.group_event_admin = Group.objects.create(name='event_admin')
+        cls.group_staff_manager = Group.objects.create(name='staff_manager')
+        cls.group_staff_member = Group.objects.create(name='staff_member')
+        cls.group_player = Group.objects.create(name='player')
+
+    @classmethod
+    def setUpPermissions(cls):
+        assign_permissions(cls.user_staff_manager,
+                           cls.group_staff_manager, cls.event)
+        assign_permissions(cls.user_staff_member,
+                           cls.group_staff_member, cls.event)
+        assign_permissions(cls.user_app_admin,
+                           cls.group_event_admin, cls.event)
+
+    @classmethod
+    def setUpEvent(cls):
+        cls.token = Token.objects.create()
+        cls.event = Event.objects.create(name='Evento 1', token=cls.token)
+
+    def queries_outside_cache(self, ctx: CaptureQueriesContext) -> list[dict]:
+        # ignora as leituras/escritas do cache (tabela django_cache e o savepoint do set)
+        return [query for query in ctx.captured_queries
+                if 'django_cache' not in query['sql'] and 'SAVEPOINT' not in query['sql']]
+
+    def cache_deletes(self, ctx: CaptureQueriesContext) -> list[dict]:
+        return [query for query in ctx.captured_queries
+                if query['sql'].startswith('DELETE FROM "django_cache"')]
 
     def remove_permissions(self):
         perm = get_perms(self.user_staff_manager, self.event)
         for p in perm:
             remove_perm(p, self.user_staff_manager, self.event)
 
-    def SetUpStaff(self):
-        self.staff1 = Staff.objects.create(
-            user=self.user_staff_manager, event=self.event, registration_email=self.create_unique_email())
-        self.staff2 = Staff.objects.create(
-            user=self.user_staff_member, event=self.event, registration_email=self.create_unique_email())
+    @classmethod
+    def SetUpStaff(cls):
+        cls.staff1 = Staff.objects.create(
+            user=cls.user_staff_manager, event=cls.event, registration_email=cls.create_unique_email())
+        cls.staff2 = Staff.objects.create(
+            user=cls.user_staff_member, event=cls.event, registration_email=cls.create_unique_email())
 
 
 class SumulaViewTest(BaseSumulaViewTest):
@@ -142,38 +162,49 @@ class SumulaViewTest(BaseSumulaViewTest):
             ]
         }
 
-    def setUpSumula(self):
-        self.sumula = SumulaImortal.objects.create(event=self.event)
-        self.sumula2 = SumulaClassificatoria.objects.create(event=self.event)
-        self.sumula3 = SumulaImortal.objects.create(event=self.event)
-
-    def setUpPlayerScore(self):
-        self.player_score1 = PlayerScore.objects.create(
-            player=self.player, sumula_imortal=self.sumula, event=self.event)
-        self.player_score2 = PlayerScore.objects.create(
-            player=self.player2, sumula_classificatoria=self.sumula2, event=self.event)
+    @classmethod
+    def setUpSumula(cls):
+        cls.sumula = SumulaImortal.objects.create(event=cls.event)
+        cls.sumula2 = SumulaClassificatoria.objects.create(event=cls.event)
+        cls.sumula3 = SumulaImortal.objects.create(event=cls.event)
+
+    @classmethod
+    def setUpPlayerScore(cls):
+        cls.player_score1 = PlayerScore.objects.create(
+            player=cls.player, sumula_imortal=cls.sumula, event=cls.event)
+        cls.player_score2 = PlayerScore.objects.create(
+            player=cls.player2, sumula_classificatoria=cls.sumula2, event=cls.event)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.setUpEvent()
+        cls.setUpSumula()
+        cls.setupUser()
+        cls.setUpGroup()
+        cls.SetUpStaff()
+        cls.setUpReferee(cls.staff1, cls.staff2, [
+            cls.sumula, cls.sumula2, cls.sumula3])
+        cls.setUpPlayers()
+        cls.setUpPlayerScore()
+        cls.setUpPermissions()
+        cls.url_post = f"{reverse('api:sumula')}?event_id={cls.event.id}"
+        cls.url_get = cls.url_post
+        cls.url_update = cls.url_post
 
     def setUp(self):
         self.client = APIClient()
-        self.setUpEvent()
-        self.setUpSumula()
-        self.setupUser()
-        self.setUpGroup()
-        self.SetUpStaff()
-        self.setUpReferee(self.staff1, self.staff2, [
-            self.sumula, self.sumula2, self.sumula3])
-        self.setUpPlayers()
-        self.setUpPlayerScore()
-        self.setUpPermissions()
-        self.url_post = f"{reverse('api:sumula')}?event_id={self.event.id}"
-        self.url_get = f"{reverse('api:sumula')}?event_id={self.event.id}"
-        self.url_update = f"{reverse('api:sumula')}?event_id={self.event.id}"
         self.setUpData()
 
     def test_get_sumulas(self):
-
         self.client.force_authenticate(user=self.user_staff_manager)
-        response = self.client.get(self.url_get)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url_get)
+        # evento + permissões + (súmulas, árbitros, pontuações) de cada tipo
+        self.assertLessEqual(len(self.queries_outside_cache(ctx)), 9)
+        # sumulas, árbitros e jogadores trazem apenas as colunas serializadas
+        for column in ('"api_player"."registration_email"', '"api_staff"."user_id"', '"api_sumulaimortal"."number"'):
+            self.assertFalse(any(column in query['sql']
+                                 for query in ctx.captured_queries), column)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 2)
         self.assertEqual(
@@ -184,6 +215,67 @@ class SumulaViewTest(BaseSumulaViewTest):
             response.data['sumulas_imortal'][0]['referee'][0]['id'], self.staff1.id)
         # self.assertEqual(response.data[0]['sumula'])
 
+    def test_get_sumulas_in_chunks(self):
+        self.client.force_authenticate(user=self.user_staff_manager)
+        expected = self.client.get(self.url_get).data
+        cache.clear()
+        with patch('api.views.base_views.SUMULAS_CHUNK_SIZE', 1):
+            response = self.client.get(self.url_get)
+        self.assertEqual(response.data, expected)
+
+    def test_get_sumulas_with_non_numeric_event_id(self):
+        self.client.force_authenticate(user=self.user_staff_manager)
+        for event_id in ('abc', '²', '١'):
+            response = self.client.get(
+                f"{reverse('api:sumula')}?event_id={event_id}")
+            self.assertEqual(response.status_code,
+                             status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(
+                response.data, {'errors': "['Evento não encontrado!']"})
+
+    def test_get_sumulas_is_cached(self):
+        self.client.force_authenticate(user=self.user_staff_manager)
+        first = self.client.get(self.url_get)
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get(self.url_get)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertFalse(any('api_sumula' in query['sql']
+                             for query in self.queries_outside_cache(ctx)))
+
+    def test_get_sumulas_cache_invalidated_on_change(self):
+        self.client.force_authenticate(user=self.user_staff_manager)
+        self.client.get(self.url_get)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sumula.description = 'Sala S9'
+            self.sumula.save()
+            self.player_score1.points = 7
+            self.player_score1.save()
+        response = self.client.get(self.url_get)
+        sumula = next(sumula for sumula in response.data['sumulas_imortal']
+                      if sumula['id'] == self.sumula.id)
+        self.assertEqual(sumula['description'], 'Sala S9')
+        self.assertEqual(sumula['players_score'][0]['points'], 7)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sumula.referee.remove(self.staff1)
+        response = self.client.get(self.url_get)
+        sumula = next(sumula for sumula in response.data['sumulas_imortal']
+                      if sumula['id'] == self.sumula.id)
+        self.assertNotIn(self.staff1.id, [
+            referee['id'] for referee in sumula['referee']])
+
+    def test_get_sumulas_cache_kept_until_commit(self):
+        self.client.force_authenticate(user=self.user_staff_manager)
+        self.client.get(self.url_get)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.sumula.description = 'Sala S9'
+            self.sumula.save()
+        self.assertTrue(callbacks)
+        response = self.client.get(self.url_get)
+        sumula = next(sumula for sumula in response.data['sumulas_imortal']
+                      if sumula['id'] == self.sumula.id)
+        self.assertNotEqual(sumula['description'], 'Sala S9')
+
     def test_get_active_sumulas(self):
         url = f"{reverse('api:sumula-ativas')}?event_id={self.event.id}"
         self.client.force_authenticate(user=self.user_staff_manager)
@@ -225,6 +317,21 @@ class SumulaViewTest(BaseSumulaViewTest):
             self.url_get)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
+    def test_generate_sumulas_invalidates_cache_once(self):
+        Player.objects.filter(event=self.event).update(is_present=True)
+        Player.objects.bulk_create([
+            Player(event=self.event, is_present=True,
+                   registration_email=self.create_unique_email())
+            for _ in range(9)
+        ])
+        self.client.force_authenticate(user=self.user_staff_manager)
+        with CaptureQueriesContext(connection) as ctx:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    f"{reverse('api:sumula-generate')}?event_id={self.event.id}")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(self.cache_deletes(ctx)), 1)
+
 
 class SumulaImortalViewTest(BaseSumulaViewTest):
     def setUpData(self):
@@ -290,36 +397,41 @@ class SumulaImortalViewTest(BaseSumulaViewTest):
             ]
         }
 
-    def setUpSumula(self):
-        self.sumula = SumulaImortal.objects.create(event=self.event)
-        self.sumula2 = SumulaImortal.objects.create(event=self.event)
-        self.sumula3 = SumulaImortal.objects.create(event=self.event)
-
-    def setUpPlayerScore(self):
-        self.player_score1 = PlayerScore.objects.create(
-            player=self.player, sumula_imortal=self.sumula, event=self.event)
-        self.player_score2 = PlayerScore.objects.create(
-            player=self.player2, sumula_imortal=self.sumula, event=self.event)
-        self.player_score3 = PlayerScore.objects.create(
-            player=self.player3, sumula_imortal=self.sumula2, event=self.event)
-        self.player_score4 = PlayerScore.objects.create(
-            player=self.player4, sumula_imortal=self.sumula2, event=self.event)
+    @classmethod
+    def setUpSumula(cls):
+        cls.sumula = SumulaImortal.objects.create(event=cls.event)
+        cls.sumula2 = SumulaImortal.objects.create(event=cls.event)
+        cls.sumula3 = SumulaImortal.objects.create(event=cls.event)
+
+    @classmethod
+    def setUpPlayerScore(cls):
+        cls.player_score1 = PlayerScore.objects.create(
+            player=cls.player, sumula_imortal=cls.sumula, event=cls.event)
+        cls.player_score2 = PlayerScore.objects.create(
+            player=cls.player2, sumula_imortal=cls.sumula, event=cls.event)
+        cls.player_score3 = PlayerScore.objects.create(
+            player=cls.player3, sumula_imortal=cls.sumula2, event=cls.event)
+        cls.player_score4 = PlayerScore.objects.create(
+            player=cls.player4, sumula_imortal=cls.sumula2, event=cls.event)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.setUpEvent()
+        cls.setUpSumula()
+        cls.setupUser()
+        cls.setUpGroup()
+        cls.SetUpStaff()
+        cls.setUpReferee(cls.staff1, cls.staff2, [
+            cls.sumula, cls.sumula2, cls.sumula3])
+        cls.setUpPlayers()
+        cls.setUpPlayerScore()
+        cls.setUpPermissions()
+        cls.url_post = f"{reverse('api:sumula-imortal')}?event_id={cls.event.id}"
+        cls.url_get = cls.url_post
+        cls.url_update = cls.url_post
 
     def setUp(self):
         self.client = APIClient()
-        self.setUpEvent()
-        self.setUpSumula()
-        self.setupUser()
-        self.setUpGroup()
-        self.SetUpStaff()
-        self.setUpReferee(self.staff1, self.staff2, [
-            self.sumula, self.sumula2, self.sumula3])
-        self.setUpPlayers()
-        self.setUpPlayerScore()
-        self.setUpPermissions()
-        self.url_post = f"{reverse('api:sumula-imortal')}?event_id={self.event.id}"
-        self.url_get = f"{reverse('api:sumula-imortal')}?event_id={self.event.id}"
-        self.url_update = f"{reverse('api:sumula-imortal')}?event_id={self.event.id}"
         self.setUpData()
 
     """*********Testes de Create*********"""
@@ -383,17 +495,16 @@ class SumulaImortalViewTest(BaseSumulaViewTest):
         response = self.client.put(
             self.url_update, self.data_update, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.sumula.refresh_from_db()
-        referees = self.sumula.referee.all()
-        scores = self.sumula.scores.all()
-        self.assertIsNotNone(self.sumula)
+        sumula = SumulaImortal.objects.prefetch_related(
+            'referee', Prefetch('scores', queryset=PlayerScore.objects.select_related('player'))).get(id=self.sumula.id)
+        referees = list(sumula.referee.all())
+        scores = list(sumula.scores.all())
+        self.assertIsNotNone(sumula)
         self.assertEqual(len(referees), 2)
         self.assertEqual(len(scores), 2)
-        self.assertEqual(self.sumula.name, 'Imortais 01')
-        self.assertEqual(self.sumula.referee.count(), 2)
-        self.assertEqual(self.sumula.scores.count(), 2)
-        self.assertFalse(SumulaImortal.objects.get(id=self.sumula.id).active)
-        self.assertEqual(self.sumula.description, "Sala S4")
+        self.assertEqual(sumula.name, 'Imortais 01')
+        self.assertFalse(sumula.active)
+        self.assertEqual(sumula.description, "Sala S4")
         for referee in referees:
             self.assertIn(
                 referee, [self.staff1, self.staff2])
@@ -447,16 +558,15 @@ class SumulaImortalViewTest(BaseSumulaViewTest):
             self.url_update, self.data_update, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
-    def tearDown(self):
-        User.objects.all().delete()
-        SumulaImortal.objects.all().delete()
-        Event.objects.all().delete()
-        PlayerScore.objects.all().delete()
-        Token.objects.all().delete()
-        Player.objects.all().delete()
-        Group.objects.all().delete()
-        self.remove_permissions()
-        self.data_post = None
+    def test_update_sumula_keeps_scores_when_one_is_not_found(self):
+
+        self.data_update['players_score'][-1]['id'] = 100
+        self.client.force_authenticate(user=self.user_staff_manager)
+        response = self.client.put(
+            self.url_update, self.data_update, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(PlayerScore.objects.filter(
+            sumula_imortal=self.sumula).exclude(points=0).exists())
 
 
 class SumulaClassificatoriaViewTest(BaseSumulaViewTest):
@@ -518,36 +628,41 @@ class SumulaClassificatoriaViewTest(BaseSumulaViewTest):
             ]
         }
 
-    def setUpSumula(self):
-        self.sumula = SumulaClassificatoria.objects.create(event=self.event)
-        self.sumula2 = SumulaClassificatoria.objects.create(event=self.event)
-        self.sumula3 = SumulaClassificatoria.objects.create(event=self.event)
-
-    def setUpPlayerScore(self):
-        self.player_score1 = PlayerScore.objects.create(
-            player=self.player, sumula_classificatoria=self.sumula, event=self.event)
-        self.player_score2 = PlayerScore.objects.create(
-            player=self.player2, sumula_classificatoria=self.sumula, event=self.event)
-        self.player_score3 = PlayerScore.objects.create(
-            player=self.player3, sumula_classificatoria=self.sumula2, event=self.event)
-        self.player_score4 = PlayerScore.objects.create(
-            player=self.player4, sumula_classificatoria=self.sumula2, event=self.event)
+    @classmethod
+    def setUpSumula(cls):
+        cls.sumula = SumulaClassificatoria.objects.create(event=cls.event)
+        cls.sumula2 = SumulaClassificatoria.objects.create(event=cls.event)
+        cls.sumula3 = SumulaClassificatoria.objects.create(event=cls.event)
+
+    @classmethod
+    def setUpPlayerScore(cls):
+        cls.player_score1 = PlayerScore.objects.create(
+            player=cls.player, sumula_classificatoria=cls.sumula, event=cls.event)
+        cls.player_score2 = PlayerScore.objects.create(
+            player=cls.player2, sumula_classificatoria=cls.sumula, event=cls.event)
+        cls.player_score3 = PlayerScore.objects.create(
+            player=cls.player3, sumula_classificatoria=cls.sumula2, event=cls.event)
+        cls.player_score4 = PlayerScore.objects.create(
+            player=cls.player4, sumula_classificatoria=cls.sumula2, event=cls.event)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.setUpEvent()
+        cls.setUpSumula()
+        cls.setupUser()
+        cls.setUpGroup()
+        cls.SetUpStaff()
+        cls.setUpReferee(cls.staff1, cls.staff2, [
+            cls.sumula, cls.sumula2, cls.sumula3])
+        cls.setUpPlayers()
+        cls.setUpPlayerScore()
+        cls.setUpPermissions()
+        cls.url_post = f"{reverse('api:sumula-classificatoria')}?event_id={cls.event.id}"
+        cls.url_get = cls.url_post
+        cls.url_update = cls.url_post
 
     def setUp(self):
         self.client = APIClient()
-        self.setUpEvent()
-        self.setUpSumula()
-        self.setupUser()
-        self.setUpGroup()
-        self.SetUpStaff()
-        self.setUpReferee(self.staff1, self.staff2, [
-            self.sumula, self.sumula2, self.sumula3])
-        self.setUpPlayers()
-        self.setUpPlayerScore()
-        self.setUpPermissions()
-        self.url_post = f"{reverse('api:sumula-classificatoria')}?event_id={self.event.id}"
-        self.url_get = f"{reverse('api:sumula-classificatoria')}?event_id={self.event.id}"
-        self.url_update = f"{reverse('api:sumula-classificatoria')}?event_id={self.event.id}"
         self.setUpData()
 
     """*********Testes de Create*********"""
@@ -565,6 +680,26 @@ class SumulaClassificatoriaViewTest(BaseSumulaViewTest):
         sumula = SumulaClassificatoria.objects.get(id=response.data['id'])
         self.assertEqual(sumula.referee.count(), 1)
 
+    def test_create_sumula_rolls_back_when_rounds_fail(self):
+        count = SumulaClassificatoria.objects.count()
+        self.data_post['players'] = self.data_post['players'][:2]
+        self.client.force_authenticate(user=self.user_staff_manager)
+        response = self.client.post(
+            self.url_post, self.data_post, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data['errors'], 'Número de jogadores insuficiente para formar duplas!')
+        self.assertEqual(SumulaClassificatoria.objects.count(), count)
+
+    def test_create_sumula_without_referees(self):
+        self.data_post.pop('referees')
+        self.client.force_authenticate(user=self.user_staff_manager)
+        response = self.client.post(
+            self.url_post, self.data_post, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        sumula = SumulaClassificatoria.objects.get(id=response.data['id'])
+        self.assertEqual(sumula.referee.count(), 0)
+
     def test_create_sumula_unauthenticated(self):
         response = self.client.post(
             self.url_post, self.data_update, format='json')
@@ -599,18 +734,16 @@ class SumulaClassificatoriaViewTest(BaseSumulaViewTest):
         response = self.client.put(
             self.url_update, self.data_update, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.sumula.refresh_from_db()
-        referees = self.sumula.referee.all()
-        scores = self.sumula.scores.all()
-        self.assertIsNotNone(self.sumula)
+        sumula = SumulaClassificatoria.objects.prefetch_related(
+            'referee', Prefetch('scores', queryset=PlayerScore.objects.select_related('player'))).get(id=self.sumula.id)
+        referees = list(sumula.referee.all())
+        scores = list(sumula.scores.all())
+        self.assertIsNotNone(sumula)
         self.assertEqual(len(referees), 2)
         self.assertEqual(len(scores), 2)
-        self.assertEqual(self.sumula.name, 'imortais 01')
-        self.assertEqual(self.sumula.referee.count(), 2)
-        self.assertEqual(self.sumula.scores.count(), 2)
-        self.assertFalse(SumulaClassificatoria.objects.get(
-            id=self.sumula.id).active)
-        self.assertEqual(self.sumula.description, "Sala S4")
+        self.assertEqual(sumula.name, 'imortais 01')
+        self.assertFalse(sumula.active)
+        self.assertEqual(sumula.description, "Sala S4")
         for referee in referees:
             self.assertIn(
                 referee, [self.staff1, self.staff2])
@@ -664,106 +797,120 @@ class SumulaClassificatoriaViewTest(BaseSumulaViewTest):
             self.url_update, self.data_update, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
-    def tearDown(self):
-        User.objects.all().delete()
-        SumulaClassificatoria.objects.all().delete()
-        Event.objects.all().delete()
-        PlayerScore.objects.all().delete()
-        Token.objects.all().delete()
-        Player.objects.all().delete()
-        Group.objects.all().delete()
-        self.remove_permissions()
-        self.data_update = None
-        self.data_post = None
+    def test_update_sumula_invalidates_cache_once(self):
+        self.client.force_authenticate(user=self.user_staff_manager)
+        with CaptureQueriesContext(connection) as ctx:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.put(
+                    self.url_update, self.data_update, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.cache_deletes(ctx)), 1)
 
 
 class GetSumulaForPlayerTest(APITestCase):
-    def create_unique_email(self):
-        return f'{uuid.uuid4()}@gmail.com'
-
-    def create_unique_username(self):
-        return f'user_{uuid.uuid4().hex[:10]}'
-
-    def setUpData(self):
-        self.expected_data_classificatoria = SumulaClassificatoriaForPlayerSerializer(
-            [self.sumula_classificatoria1, self.sumula_classificatoria2], many=True).data
-        self.player.is_imortal = True
-        self.player.save()
-        self.expected_data_imortal = SumulaImortalForPlayerSerializer(
-            [self.sumula_imortal1, self.sumula_imortal2], many=True).data
-        self.player.is_imortal = False
-        self.player.save()
-
-    def setUpSumula(self):
-        self.sumula_imortal1 = SumulaImortal.objects.create(
-            event=self.event, name='Imortais 01')
-        self.sumula_imortal2 = SumulaImortal.objects.create(
-            event=self.event, name='Imortais 02')
-        self.sumula_classificatoria1 = SumulaClassificatoria.objects.create(
-            event=self.event, name='Chave 01')
-        self.sumula_classificatoria2 = SumulaClassificatoria.objects.create(
-            event=self.event, name='Chave 02')
-
-    def setUpReferee(self, staff1: Staff, staff2: Staff, sumulas: list):
+    @classmethod
+    def create_unique_email(cls):
+        return f'{secrets.token_hex(8)}@gmail.com'
+
+    @classmethod
+    def create_unique_username(cls):
+        return f'user_{secrets.token_hex(5)}'
+
+    @classmethod
+    def setUpData(cls):
+        cls.expected_data_classificatoria = SumulaClassificatoriaForPlayerSerializer(
+            [cls.sumula_classificatoria1, cls.sumula_classificatoria2], many=True).data
+        cls.player.is_imortal = True
+        cls.player.save()
+        cls.expected_data_imortal = SumulaImortalForPlayerSerializer(
+            [cls.sumula_imortal1, cls.sumula_imortal2], many=True).data
+        cls.player.is_imortal = False
+        cls.player.save()
+
+    @classmethod
+    def setUpSumula(cls):
+        cls.sumula_imortal1 = SumulaImortal.objects.create(
+            event=cls.event, name='Imortais 01')
+        cls.sumula_imortal2 = SumulaImortal.objects.create(
+            event=cls.event, name='Imortais 02')
+        cls.sumula_classificatoria1 = SumulaClassificatoria.objects.create(
+            event=cls.event, name='Chave 01')
+        cls.sumula_classificatoria2 = SumulaClassificatoria.objects.create(
+            event=cls.event, name='Chave 02')
+
+    @classmethod
+    def setUpReferee(cls, staff1: Staff, staff2: Staff, sumulas: list):
         for sumula in sumulas:
-            sumula.referee.add(staff1)
-            sumula.referee.add(staff2)
-
-    def setUpPlayers(self):
-        self.player = Player.objects.create(
-            user=self.user, event=self.event, registration_email=self.create_unique_email())
-
-    def setUpPlayerScore(self):
-        self.player_score1_imortal = PlayerScore.objects.create(
-            player=self.player, sumula_imortal=self.sumula_imortal1, event=self.event)
-        self.player_score2_imortal = PlayerScore.objects.create(
-            player=self.player, sumula_imortal=self.sumula_imortal2, event=self.event)
-        self.player_score1_classificatoria = PlayerScore.objects.create(
-            player=self.player, sumula_classificatoria=self.sumula_classificatoria1, event=self.event)
-        self.player_score2_classificatoria = PlayerScore.objects.create(
-            player=self.player, sumula_classificatoria=self.sumula_classificatoria2, event=self.event)
-
-    def setUpGroup(self):
-        self.group_app_admin = Group.objects.create(name='app_admin')
-        self.group_player = Group.objects.create(name='player')
-
-    def setUpPermissions(self):
-        assign_permissions(self.user, self.group_player, self.event)
-
-    def setUpEvent(self):
-        self.token = Token.objects.create()
-        self.event = Event.objects.create(name='Evento 1', token=self.token)
-
-    def setUpUser(self):
-        self.user = User.objects.create(
+            sumula.referee.add(staff1, staff2)
+
+    @classmethod
+    def setUpPlayers(cls):
+        cls.player = Player.objects.create(
+            user=cls.user, event=cls.event, registration_email=cls.create_unique_email())
+
+    @classmethod
+    def setUpPlayerScore(cls):
+        cls.player_score1_imortal = PlayerScore.objects.create(
+            player=cls.player, sumula_imortal=cls.sumula_imortal1, event=cls.event)
+        cls.player_score2_imortal = PlayerScore.objects.create(
+            player=cls.player, sumula_imortal=cls.sumula_imortal2, event=cls.event)
+        cls.player_score1_classificatoria = PlayerScore.objects.create(
+            player=cls.player, sumula_classificatoria=cls.sumula_classificatoria1, event=cls.event)
+        cls.player_score2_classificatoria = PlayerScore.objects.create(
+            player=cls.player, sumula_classificatoria=cls.sumula_classificatoria2, event=cls.event)
+
+    @classmethod
+    def setUpGroup(cls):
+        cls.group_app_admin = Group.objects.create(name='app_admin')
+        cls.group_player = Group.objects.create(name='player')
+
+    @classmethod
+    def setUpPermissions(cls):
+        assign_permissions(cls.user, cls.group_player, cls.event)
+
+    @classmethod
+    def setUpEvent(cls):
+        cls.token = Token.objects.create()
+        cls.event = Event.objects.create(name='Evento 1', token=cls.token)
+
+    @classmethod
+    def setUpUser(cls):
+        cls.user = User.objects.create(
             username='test_user', email='example@email.com', first_name='Test', last_name='User')
-        self.user2 = User.objects.create(
+        cls.user2 = User.objects.create(
             username='test_user2', email='example2@email.com', first_name='Test2', last_name='User2')
 
-    def SetUpStaff(self):
-        self.staff1 = Staff.objects.create(
-            user=self.user2, event=self.event, registration_email=self.create_unique_email())
-        self.staff2 = Staff.objects.create(
-            user=self.user, event=self.event, registration_email=self.create_unique_email())
+    @classmethod
+    def SetUpStaff(cls):
+        cls.staff1 = Staff.objects.create(
+            user=cls.user2, event=cls.event, registration_email=cls.create_unique_email())
+        cls.staff2 = Staff.objects.create(
+            user=cls.user, event=cls.event, registration_email=cls.create_unique_email())
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.setUpEvent()
+        cls.setUpUser()
+        cls.setUpSumula()
+        cls.setUpPlayers()
+        cls.setUpPlayerScore()
+        cls.setUpGroup()
+        cls.SetUpStaff()
+        cls.setUpReferee(cls.staff2, cls.staff1, [
+                         cls.sumula_imortal1, cls.sumula_imortal2, cls.sumula_classificatoria1, cls.sumula_classificatoria2])
+        cls.setUpPermissions()
+        cls.setUpData()
+        cls.base_url = reverse('api:sumula-player')
+        cls.url = f'{cls.base_url}?event_id={cls.event.id}'
 
     def setUp(self):
-        self.setUpEvent()
-        self.setUpUser()
-        self.setUpSumula()
-        self.setUpPlayers()
-        self.setUpPlayerScore()
-        self.setUpGroup()
-        self.SetUpStaff()
-        self.setUpReferee(self.staff2, self.staff1, [
-                          self.sumula_imortal1, self.sumula_imortal2, self.sumula_classificatoria1, self.sumula_classificatoria2])
-        self.setUpPermissions()
-        self.setUpData()
         self.client = APIClient()
-        self.url = f'{reverse("api:sumula-player")}?event_id={self.event.id}'
 
     def test_get_sumulas_for_player_not_imortal(self):
         self.client.force_authenticate(user=self.user)
-        response = self.client.get(self.url)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertLessEqual(len(ctx.captured_queries), 7)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data, self.expected_data_classificatoria)
         self.assertEqual(len(response.data), 2)
@@ -790,14 +937,14 @@ class GetSumulaForPlayerTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
     def test_get_sumulas_for_player_invalid_event_id(self):
-        url = f'{reverse("api:sumula-player")}?event_id=10000'
+        url = f'{self.base_url}?event_id=10000'
         self.client.force_authenticate(user=self.user)
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_get_sumulas_for_player_without_event_id(self):
         self.client.force_authenticate(user=self.user)
-        response = self.client.get(reverse('api:sumula-player'))
+        response = self.client.get(self.base_url)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_get_sumulas_for_player_unauthorized(self):
@@ -811,33 +958,27 @@ class GetSumulaForPlayerTest(APITestCase):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
-    def tearDown(self) -> None:
-        Event.objects.all().delete()
-        SumulaImortal.objects.all().delete()
-        SumulaClassificatoria.objects.all().delete()
-        Player.objects.all().delete()
-        PlayerScore.objects.all().delete()
-        User.objects.all().delete()
-        Group.objects.all().delete()
-        Token.objects.all().delete()
-
 
 class AddRefereeToSumulaTestCase(BaseSumulaViewTest):
-    def setUpSumula(self):
-        self.sumula_imortal1 = SumulaImortal.objects.create(event=self.event)
-        self.sumula_classficatoria1 = SumulaClassificatoria.objects.create(
-            event=self.event)
-        self.sumula_imortal2 = SumulaImortal.objects.create(event=self.event)
+    @classmethod
+    def setUpSumula(cls):
+        cls.sumula_imortal1 = SumulaImortal.objects.create(event=cls.event)
+        cls.sumula_classficatoria1 = SumulaClassificatoria.objects.create(
+            event=cls.event)
+        cls.sumula_imortal2 = SumulaImortal.objects.create(event=cls.event)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.setUpEvent()
+        cls.setupUser()
+        cls.setUpGroup()
+        cls.SetUpStaff()
+        cls.setUpSumula()
+        cls.setUpPermissions()
+        cls.url = f"{reverse('api:sumula-add-referee')}?event_id={cls.event.id}"
 
     def setUp(self):
         self.client = APIClient()
-        self.setUpEvent()
-        self.setupUser()
-        self.setUpGroup()
-        self.SetUpStaff()
-        self.setUpSumula()
-        self.setUpPermissions()
-        self.url = f"{reverse('api:sumula-add-referee')}?event_id={self.event.id}"
         self.data = {
             "sumula_id": self.sumula_imortal1.id,
             "is_imortal": True
@@ -878,14 +1019,3 @@ class AddRefereeToSumulaTestCase(BaseSumulaViewTest):
         self.client.force_authenticate(user=self.user_staff_manager)
         response = self.client.put(self.url, self.data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-
-    def tearDown(self) -> None:
-        Event.objects.all().delete()
-        SumulaImortal.objects.all().delete()
-        SumulaClassificatoria.objects.all().delete()
-        Player.objects.all().delete()
-        PlayerScore.objects.all().delete()
-        User.objects.all().delete()
-        Group.objects.all().delete()
-        Token.objects.all().delete()
-        Staff.objects.all().delete()
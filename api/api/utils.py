@@ -2,7 +2,10 @@ from rest_framework import status, response
 from django.contrib.contenttypes.models import ContentType
 from rest_framework import status, response
 from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db import transaction
 import random
+import threading
 
 
 def handle_400_error(error_msg: str) -> response.Response:
@@ -23,6 +26,46 @@ def get_permissions(content_type):
     return Permission.objects.filter(content_type=content_type)
 
 
+SUMULAS_CACHE_TIMEOUT = 60
+
+
+def get_sumulas_cache_key(event_id: int, active: bool = None) -> str:
+    """ Função para retornar a chave de cache das sumulas serializadas de um evento."""
+    return f'sumulas:{event_id}:{active}'
+
+
+# Eventos com sumulas alteradas aguardando a remoção do cache (um conjunto por thread,
+# pois cada thread tem sua própria conexão e transação)
+_pending_sumulas_invalidations = threading.local()
+
+
+def _pending_sumulas_events() -> set[int]:
+    if not hasattr(_pending_sumulas_invalidations, 'events'):
+        _pending_sumulas_invalidations.events = set()
+    return _pending_sumulas_invalidations.events
+
+
+def _delete_pending_sumulas_cache() -> None:
+    events = _pending_sumulas_events()
+    if not events:
+        return
+    keys = [get_sumulas_cache_key(event_id, active)
+            for event_id in events for active in (None, True, False)]
+    events.clear()
+    cache.delete_many(keys)
+
+
+def invalidate_sumulas_cache(event_id: int) -> None:
+    """ Função para invalidar as sumulas em cache de um evento (todas, ativas e encerradas).
+    A remoção acontece após o commit da transação atual, então um rollback não apaga o cache.
+    O evento é marcado como pendente e o primeiro callback de on_commit a rodar remove as chaves
+    de todos os eventos pendentes em um único delete_many; os demais não fazem nada.
+    Uma leitura concorrente ainda pode gravar dados antigos no cache logo após a remoção,
+    e nesse caso eles ficam lá por no máximo SUMULAS_CACHE_TIMEOUT segundos."""
+    _pending_sumulas_events().add(event_id)
+    transaction.on_commit(_delete_pending_sumulas_cache)
+
+
 def generate_random_name():
     names = ['João', 'José', 'Pedro', 'Paulo', 'Lucas', 'Mário', 'Luiz', 'Carlos', 'Ricardo', 'Roberto',
              'Maria', 'Ana', 'Clara', 'Lúcia', 'Luíza', 'Mariana', 'Carla', 'Rita', 'Rosa', 'Beatriz', 'Juliana', 'Júlia', 'Laura', 'Lara']
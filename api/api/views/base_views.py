@@ -1,7 +1,10 @@
 from ..models import Event, PlayerScore, Staff, SumulaImortal, SumulaClassificatoria, Player
-from ..serializers import PlayerScoreForRoundRobinSerializer
+from ..serializers import PlayerSerializer, PlayerScoreForRoundRobinSerializer, SumulaSerializer, SumulaImortalSerializer, SumulaClassificatoriaSerializer
+from ..utils import SUMULAS_CACHE_TIMEOUT, get_sumulas_cache_key
 from io import StringIO
 from django.db import transaction
+from django.db.models import QuerySet
+from django.core.cache import cache
 # from django.db.models import BaseManager
 import chardet
 from django.utils.deprecation import MiddlewareMixin
@@ -17,12 +20,15 @@ EVENT_ID_NOT_PROVIDED_ERROR_MESSAGE = "Id do evento não fornecido!"
 SUMULA_NOT_FOUND_ERROR_MESSAGE = "Sumula não encontrada!"
 SUMULA_ID_NOT_PROVIDED_ERROR_MESSAGE = "Id da sumula não fornecido!"
 SUMULA_NOT_FOUND_ERROR_MESSAGE = "Sumula não encontrada!"
+SUMULAS_CHUNK_SIZE = 200
 
 
 class BaseView(APIView):
-    def get_event(self) -> Event:
+    def get_event(self, loaded_event: Event | None = None) -> Event:
         """ Verifica se o evento existe.
         Retorna o evento associado ao id fornecido ou uma exceção.
+        Se loaded_event (ex.: sumula.event já carregado via select_related) for o evento
+        pedido, ele é reaproveitado sem uma nova consulta.
         - ValidationError: Se o id do evento não foi fornecido.
         - NotFound: Se o evento não foi encontrado.
         """
@@ -31,11 +37,22 @@ class BaseView(APIView):
         event_id = self.request.query_params.get('event_id')
         if not event_id:
             raise ValidationError(EVENT_ID_NOT_PROVIDED_ERROR_MESSAGE)
-        event = Event.objects.filter(id=event_id).first()
+        if not (event_id.isascii() and event_id.isdecimal()):
+            raise ValidationError(EVENT_NOT_FOUND_ERROR_MESSAGE)
+        if loaded_event is not None and str(loaded_event.pk) == event_id:
+            event = loaded_event
+        else:
+            event = Event.objects.filter(id=event_id).first()
         if not event:
             raise ValidationError(EVENT_NOT_FOUND_ERROR_MESSAGE)
         return event
 
+    def read_players(self, players: QuerySet[Player]) -> list[dict]:
+        """Retorna os jogadores no formato de PlayerSerializer.
+        Os campos do serializer são colunas de Player, então a leitura é feita direto
+        com values(), sem instanciar models ou serializers para cada jogador."""
+        return list(players.values(*PlayerSerializer.Meta.fields))
+
     def treat_name_and_email_excel(self, name: str, email: str) -> tuple[str, str]:
         """Trata o nome e o email de um jogador para serem inseridos no banco de dados."""
         if name.__class__ != str or email.__class__ != str:
@@ -217,27 +234,47 @@ class BaseSumulaView(BaseView):
                 event=event, active=active).order_by('name')
             sumula_classificatoria = SumulaClassificatoria.objects.filter(
                 event=event, active=active).order_by('name')
+        sumula_imortal = SumulaImortalSerializer.prefetch_queryset(
+            sumula_imortal)
+        sumula_classificatoria = SumulaClassificatoriaSerializer.prefetch_queryset(
+            sumula_classificatoria)
         return sumula_imortal, sumula_classificatoria
 
+    def get_serialized_sumulas(self, event: Event, active: bool = None) -> dict:
+        """Retorna as sumulas do evento no formato de SumulaSerializer.
+        O resultado fica em cache até que uma sumula, pontuação, jogador ou árbitro do evento mude.
+        As sumulas são lidas em blocos de SUMULAS_CHUNK_SIZE (com seus prefetches), então apenas um
+        bloco de instâncias fica em memória durante a serialização."""
+        def serialize() -> dict:
+            sumulas_imortal, sumulas_classificatoria = self.get_sumulas(
+                event=event, active=active)
+            return SumulaSerializer({
+                'sumulas_classificatoria': sumulas_classificatoria.iterator(chunk_size=SUMULAS_CHUNK_SIZE),
+                'sumulas_imortal': sumulas_imortal.iterator(chunk_size=SUMULAS_CHUNK_SIZE)}).data
+        return cache.get_or_set(get_sumulas_cache_key(event.id, active), serialize, timeout=SUMULAS_CACHE_TIMEOUT)
+
     def create_players_score(self, players: list, sumula: SumulaImortal | SumulaClassificatoria, event: Event,) -> list[PlayerScore] | ValidationError:
-        """Cria uma lista de PlayerScore associados a uma sumula."""
-        players_score = []
+        """Cria uma lista de PlayerScore associados a uma sumula.
+        Os jogadores são buscados (e travados) em uma única consulta e as pontuações
+        inseridas com um único bulk_create, na ordem em que foram enviados.
+        Como os jogadores são do evento e a sumula é nova, as validações de PlayerScore.save
+        já são satisfeitas, e uma pontuação zerada não altera o total_score do jogador.
+        """
+        sumula_field = 'sumula_imortal' if sumula.__class__ == SumulaImortal else 'sumula_classificatoria'
         try:
             with transaction.atomic():
-                for player in players:
-                    player_id = player.get('id')
-                    if player_id is None:
-                        continue
-                    player_obj = Player.objects.select_for_update().filter(id=player_id).first()
+                requested = [player for player in players if player.get('id') is not None]
+                players_by_id = Player.objects.select_for_update().filter(
+                    event=event, id__in=[player['id'] for player in requested]).in_bulk()
+                players_score = []
+                for player in requested:
+                    player_obj = players_by_id.get(int(player['id']))
                     if not player_obj:
                         raise ValidationError(
                             f"Jogador {player.get('name')} não encontrado!")
-                    if sumula.__class__ == SumulaImortal:
-                        players_score.append(PlayerScore.objects.create(
-                            player=player_obj, sumula_imortal=sumula, event=event))
-                    else:
-                        players_score.append(PlayerScore.objects.create(
-                            player=player_obj, sumula_classificatoria=sumula, event=event))
+                    players_score.append(PlayerScore(
+                        player=player_obj, event=event, **{sumula_field: sumula}))
+                PlayerScore.objects.bulk_create(players_score)
                 logger.info(
                     f"{len(players_score)} PlayerScores criados para a sumula {sumula.id}")
             return players_score
@@ -247,55 +284,53 @@ class BaseSumulaView(BaseView):
             raise ValidationError("Erro ao criar PlayerScores!")
 
     def add_referees(self, sumula: SumulaImortal | SumulaClassificatoria, event: Event, referees: list) -> None:
-        """Adiciona um árbitro a uma sumula."""
-        if referees == []:
+        """Adiciona os árbitros a uma sumula.
+        Os Staffs do evento são buscados em uma única consulta e adicionados de uma vez."""
+        ids = [referee.get('id') for referee in referees if referee.get('id') is not None]
+        if not ids:
             return
-        for referee in referees:
-            id = referee.get('id')
-            if id is None:
-                continue
-            staff = Staff.objects.filter(id=id, event=event).first()
-            if referee is not None:
-                sumula.referee.add(staff)
-        sumula.save()
+        sumula.referee.add(*Staff.objects.filter(id__in=ids, event=event))
 
-    def update_player_score(self, players_score: list[dict]) -> bool:
-        """Atualiza a pontuação de um jogador."""
+    def update_player_score(self, players_score: list[dict], event: Event) -> bool:
+        """Atualiza a pontuação de um jogador.
+        As pontuações do evento são buscadas em uma única consulta; se algum id não existir, nada é alterado."""
+        if any(player_score.get('id') is None for player_score in players_score):
+            return False
+        ids = {str(player_score['id']) for player_score in players_score}
+        players_score_by_id = {str(obj.id): obj for obj in PlayerScore.objects.select_related(
+            'event', 'player__event', 'sumula_classificatoria', 'sumula_imortal').filter(
+            event=event, id__in=ids)}
+        if ids - players_score_by_id.keys():
+            return False
         for player_score in players_score:
-            player_score_id = player_score.get('id')
-            if player_score_id is None:
-                return False
-            player_score_obj = PlayerScore.objects.filter(
-                id=player_score_id).first()
-            if not player_score_obj:
-                return False
+            player_score_obj = players_score_by_id[str(player_score['id'])]
             player_score_obj.points = player_score['points']
             player_score_obj.save()
         return True
 
+    @transaction.atomic
     def update_sumula(self, sumula: SumulaImortal | SumulaClassificatoria, event: Event) -> None | ValidationError:
-        """Atualiza uma sumula."""
-        players_score = self.request.data['players_score']
+        """Atualiza uma sumula. As pontuações, os imortais e a sumula são gravados em uma única transação."""
+        data = self.request.data
+        players_score = data['players_score']
 
-        if not self.update_player_score(players_score):
+        if not self.update_player_score(players_score, event):
             raise ValidationError("Dados de pontuação inválidos!")
 
-        if 'imortal_players' in self.request.data:
-            players = self.request.data['imortal_players']
-            for player in players:
-                player_id = player.get('id')
-                if player_id is None:
-                    continue
-                player_obj = Player.objects.filter(id=player_id).first()
-                if not player_obj:
-                    raise ValidationError("Jogador não encontrado!")
+        if 'imortal_players' in data:
+            ids = {str(player.get('id')) for player in data['imortal_players']
+                   if player.get('id') is not None}
+            players = list(Player.objects.filter(event=event, id__in=ids))
+            if ids - {str(player_obj.id) for player_obj in players}:
+                raise ValidationError("Jogador não encontrado!")
+            for player_obj in players:
                 player_obj.is_imortal = True
                 player_obj.save()
 
-        sumula.description = self.request.data['description']
+        sumula.description = data['description']
         sumula.active = False
         if sumula.__class__ != SumulaImortal:
-            sumula.name = self.request.data['name']
+            sumula.name = data['name']
         sumula.save()
 
     def validate_if_staff_is_sumula_referee(self, sumula: SumulaClassificatoria | SumulaImortal, event: Event) -> Exception | Staff:
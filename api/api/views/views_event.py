@@ -11,7 +11,7 @@ from api.models import Token, Event, Staff, Player, Results
 from ..serializers import EventSerializer, PlayerResultsSerializer, UserEventsSerializer, ResultsSerializer
 from ..utils import handle_400_error
 from ..swagger import Errors, manual_parameter_event_id
-from ..permissions import assign_permissions
+from ..permissions import assign_permissions, has_event_perm
 
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -57,9 +57,9 @@ class EventPermissions(BasePermission):
     def has_object_permission(self, request, view, obj):
         # Verifica se o usuário tem a permissão 'delete_event' para o objeto específico
         if request.method == 'DELETE':
-            return request.user.has_perm('api.delete_event', obj)
+            return has_event_perm(request, 'api.delete_event', obj)
         if request.method == 'PUT':
-            return request.user.has_perm('api.change_event', obj)
+            return has_event_perm(request, 'api.change_event', obj)
 
 
 class EventView(BaseView):
@@ -119,7 +119,7 @@ class EventView(BaseView):
         events = request.user.events.all()
         data_to_serialize = []
         for event in events:
-            if event.admin_email == request.user.email:
+            if event.is_admin_user(request.user):
                 data_to_serialize.append(
                     {'event': event, 'role': 'admin'})
                 continue
@@ -219,7 +219,7 @@ class EventView(BaseView):
             return handle_400_error("Nome do evento não fornecido!")
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(request, event)
         name = request.data['name']
@@ -237,10 +237,10 @@ class EventView(BaseView):
 
     def handle_event_permissions(self, request, event, created) -> tuple[int, dict]:
         data = EventSerializer(event).data
-        if not created and request.user.email != event.admin_email:
+        if not created and not event.is_admin_user(request.user):
             data = {'errors': 'Você não é o administrador deste evento.'}
             return status.HTTP_403_FORBIDDEN, data
-        elif not created and request.user.email == event.admin_email:
+        elif not created:
             return status.HTTP_200_OK, data
 
         event.admin_email = request.user.email
@@ -284,11 +284,11 @@ class EventView(BaseView):
 class ResultsPermissions(BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method == 'PUT':
-            return request.user.has_perm('api.change_event', obj)
+            return has_event_perm(request, 'api.change_event', obj)
         if request.method == 'DELETE':
-            return request.user.has_perm('api.delete_event', obj)
+            return has_event_perm(request, 'api.delete_event', obj)
         if request.method == 'GET':
-            return request.user.has_perm('api.view_player_event', obj)
+            return has_event_perm(request, 'api.view_player_event', obj)
         return True
 
 
@@ -332,7 +332,7 @@ class ResultsView(BaseView):
                 'Nenhum campo fornecido: top4, paladin, ambassor.')
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         if event not in request.user.events.all():
             return response.Response(status=status.HTTP_403_FORBIDDEN, data={'errors': 'Você não tem permissão para acessar este evento.'})
@@ -380,7 +380,7 @@ class ResultsView(BaseView):
         """Deleta o resultado de um evento."""
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(request, event)
         if event not in request.user.events.all():
@@ -449,7 +449,7 @@ class ResultsView(BaseView):
     def get(self, request: request.Request, *args, **kwargs):
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         if event not in request.user.events.all():
             return response.Response(status=status.HTTP_403_FORBIDDEN, data={'errors': 'Você não tem permissão para acessar este evento.'})
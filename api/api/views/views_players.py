@@ -17,7 +17,7 @@ from api.models import Event, Player, Results
 from ..utils import handle_400_error
 from ..serializers import PlayerSerializer, UploadFileSerializer, PlayerResultsSerializer, PlayerLoginSerializer
 from ..swagger import Errors, manual_parameter_event_id
-from ..permissions import assign_permissions
+from ..permissions import assign_permissions, has_event_perm
 import pandas as pd
 import chardet
 import os
@@ -26,13 +26,13 @@ import os
 class PlayersPermission(BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method == 'GET':
-            return request.user.has_perm('api.view_player_event', obj)
+            return has_event_perm(request, 'api.view_player_event', obj)
         if request.method == 'POST':
-            return request.user.has_perm('api.add_player_event', obj)
+            return has_event_perm(request, 'api.add_player_event', obj)
         if request.method == 'PUT':
-            return request.user.has_perm('api.change_player_event', obj)
+            return has_event_perm(request, 'api.change_player_event', obj)
         if request.method == 'DELETE':
-            return request.user.has_perm('api.delete_player_event', obj)
+            return has_event_perm(request, 'api.delete_player_event', obj)
         return True
 
 
@@ -50,18 +50,13 @@ class PlayersView(BaseView):
         """ Retorna todos os jogadores de um evento."""
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(request, event)
 
-        players = Player.objects.filter(event=event)
-        if not players:
+        data = self.read_players(Player.objects.filter(event=event))
+        if not data:
             return response.Response(status=status.HTTP_200_OK, data=['Nenhum jogador encontrado!'])
-        players_list = []
-        for player in players:
-            players_list.append(player)
-
-        data = PlayerSerializer(players_list, many=True).data
 
         return response.Response(status=status.HTTP_200_OK, data=data)
 
@@ -124,7 +119,7 @@ class PlayersView(BaseView):
             return handle_400_error('ID do jogador é obrigatório!')
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(request, event)
         player_id = request.data.get('id')
@@ -175,7 +170,7 @@ class PlayersView(BaseView):
             return handle_400_error('Dados Inválidos!')
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         if event not in request.user.events.all():
             return handle_400_error('Usuário não tem permissão para acessar este evento!')
@@ -245,7 +240,8 @@ class GetPlayerResults(BaseView):
         if not event.is_imortal_results_published:
             return response.Response(status=status.HTTP_403_FORBIDDEN, data='Resultados de pontuação não publicados!')
         self.check_object_permissions(request, event)
-        player = Player.objects.filter(event=event, user=request.user).first()
+        player = Player.objects.filter(event=event, user=request.user).only(
+            *PlayerResultsSerializer.Meta.fields).first()
         if not player:
             return handle_400_error('Jogador não encontrado!')
 
@@ -386,7 +382,7 @@ class AddSinglePlayer(BaseView):
             return handle_400_error('Dados Inválidos!')
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(request, event)
         full_name = request.data['full_name']
@@ -458,16 +454,12 @@ class GetNotImortalPlayers(BaseView):
         """ Retorna todos os jogadores não imortais do evento."""
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(request, event)
 
-        players = Player.objects.filter(event=event, is_imortal=False)
-        players_list = []
-        for player in players:
-            players_list.append(player)
-
-        data = PlayerSerializer(players_list, many=True).data
+        data = self.read_players(
+            Player.objects.filter(event=event, is_imortal=False))
 
         return response.Response(status=status.HTTP_200_OK, data=data)
 
@@ -488,14 +480,14 @@ class ExportPlayersView(BaseView):
     def get(self, request, *args, **kwargs):
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
 
         self.check_object_permissions(request, event)
 
-        players = Player.objects.filter(
-            event=event, is_imortal=False, total_score__gt=0)
-        print(players)
+        players = list(Player.objects.filter(
+            event=event, is_imortal=False, total_score__gt=0).values_list(
+                'full_name', 'registration_email', 'social_name'))
         if not players:
             return handle_400_error('Nenhum jogador encontrado!')
 
@@ -509,14 +501,10 @@ class ExportPlayersView(BaseView):
 
         return response
 
-    def generate_excel(self, players):
-        # Cria um DataFrame com os dados dos jogadores
-        data = {
-            'Nome Completo': [player.full_name for player in players],
-            'Email': [player.registration_email for player in players],
-            'Nome Social': [player.social_name for player in players],
-        }
-        df = pd.DataFrame(data)
+    def generate_excel(self, players: list[tuple]):
+        # Cria um DataFrame direto das tuplas (nome completo, email, nome social)
+        df = pd.DataFrame.from_records(
+            players, columns=['Nome Completo', 'Email', 'Nome Social'])
 
         # Salva o DataFrame em um buffer de memória
         buffer = BytesIO()
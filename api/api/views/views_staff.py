@@ -19,7 +19,7 @@ from ..serializers import EventSerializer, StaffSerializer, UploadFileSerializer
 from .views_event import TOKEN_NOT_PROVIDED_ERROR_MESSAGE, TOKEN_NOT_FOUND_ERROR_MESSAGE, EVENT_NOT_FOUND_ERROR_MESSAGE
 from ..utils import handle_400_error
 from ..swagger import Errors, manual_parameter_event_id
-from ..permissions import assign_permissions
+from ..permissions import assign_permissions, has_event_perm
 
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -30,11 +30,11 @@ class StaffPermissions(BasePermission):
     def has_object_permission(self, request, view, obj):
 
         if request.method == 'GET':
-            return request.user.has_perm('api.add_sumula_event', obj)
+            return has_event_perm(request, 'api.add_sumula_event', obj)
         if request.method == 'PUT':
-            return request.user.has_perm('api.change_event', obj)
+            return has_event_perm(request, 'api.change_event', obj)
         if request.method == 'DELETE':
-            return request.user.has_perm('api.delete_event', obj)
+            return has_event_perm(request, 'api.delete_event', obj)
         return False
 
 
@@ -105,7 +105,7 @@ class StaffView(BaseView):
         """Retorna os usuários staff_member associados ao evento."""
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(request, event)
         staffs = event.staff.all()
@@ -146,7 +146,7 @@ class StaffView(BaseView):
             return handle_400_error('Dados inválidos!')
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(self.request, event)
         staff_id = request.data['id']
@@ -199,7 +199,7 @@ class StaffView(BaseView):
             return handle_400_error('ID do monitor não fornecido!')
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(self.request, event)
         staff_id = request.data['id']
@@ -215,7 +215,7 @@ class StaffView(BaseView):
 class AddStaffManagerPermissions(BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method == 'POST':
-            return request.user.has_perm('api.change_event', obj)
+            return has_event_perm(request, 'api.change_event', obj)
         return False
 
 
@@ -245,7 +245,7 @@ class AddStaffManager(BaseView):
             return handle_400_error('Email do Usuário não fornecido!')
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(request, event)
 
@@ -266,7 +266,7 @@ class AddStaffManager(BaseView):
 class AddStaffPermissions(BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method == 'POST':
-            return request.user.has_perm('api.change_event', obj)
+            return has_event_perm(request, 'api.change_event', obj)
         return False
 
 
@@ -390,7 +390,7 @@ class AddSingleStaff(BaseView):
             return handle_400_error('Dados inválidos!')
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
 
         self.check_object_permissions(self.request, event)
@@ -433,7 +433,7 @@ class DeleteAllStaffs(BaseView):
     def delete(self, request: request.Request, *args, **kwargs):
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(request, event)
         staffs = Staff.objects.filter(event=event)
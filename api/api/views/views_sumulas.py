@@ -1,13 +1,15 @@
 from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
 from rest_framework import status, request, response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.permissions import BasePermission
 from .base_views import BaseSumulaView, SUMULA_NOT_FOUND_ERROR_MESSAGE, SUMULA_ID_NOT_PROVIDED_ERROR_MESSAGE
 from api.models import Staff, SumulaClassificatoria, SumulaImortal, PlayerScore, Player
-from ..serializers import PlayerScoreSerializer, SumulaSerializer, SumulaForPlayerSerializer, SumulaImortalSerializer, SumulaClassificatoriaSerializer, SumulaClassificatoriaForPlayerSerializer, SumulaImortalForPlayerSerializer
+from ..serializers import PlayerScoreSerializer, SumulaForPlayerSerializer, SumulaImortalSerializer, SumulaClassificatoriaSerializer, SumulaClassificatoriaForPlayerSerializer, SumulaImortalForPlayerSerializer
 from rest_framework.permissions import BasePermission
 from ..utils import handle_400_error
-from ..swagger import Errors, sumula_imortal_api_put_schema, sumula_classicatoria_api_put_schema, sumulas_response_schema, manual_parameter_event_id, sumulas_response_for_player_schema, array_of_sumulas_response_schema
+from ..permissions import has_event_perm
+from ..swagger import Errors, sumula_imortal_api_put_schema, sumula_classicatoria_api_put_schema, sumula_imortal_api_post_schema, sumula_classificatoria_api_post_schema, sumulas_response_schema, manual_parameter_event_id, sumulas_response_for_player_schema, array_of_sumulas_response_schema
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 import random
@@ -15,20 +17,21 @@ import string
 import logging
 from django.core.exceptions import ValidationError
 SUMULA_IS_CLOSED_ERROR_MESSAGE = "Súmula já encerrada só pode ser editada por um gerente ou adminstrador!"
+SUMULA_PUT_REQUIRED_FIELDS = frozenset({'id', 'name', 'description'})
+SUMULA_IMORTAL_POST_REQUIRED_FIELDS = frozenset({'players', 'referees'})
 
 
 class HasSumulaPermission(BasePermission):
-    def has_object_permission(self, request, view, obj) -> bool:
+    _PERM_MAP = {
+        'POST': 'api.add_sumula_event',
+        'GET': 'api.view_sumula_event',
+        'PUT': 'api.change_sumula_event',
+        'DELETE': 'api.delete_sumula_event',
+    }
 
-        if request.method == 'POST':
-            return request.user.has_perm('api.add_sumula_event', obj)
-        elif request.method == 'GET':
-            return request.user.has_perm('api.view_sumula_event', obj)
-        elif request.method == 'PUT':
-            return request.user.has_perm('api.change_sumula_event', obj)
-        elif request.method == 'DELETE':
-            return request.user.has_perm('api.delete_sumula_event', obj)
-        return True
+    def has_object_permission(self, request, view, obj) -> bool:
+        perm = self._PERM_MAP.get(request.method)
+        return has_event_perm(request, perm, obj) if perm else True
 
 
 class SumulasView(BaseSumulaView):
@@ -46,13 +49,10 @@ class SumulasView(BaseSumulaView):
         """Retorna todas as sumulas associadas a um evento."""
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(self.request, event)
-        sumulas_imortal, sumulas_classificatoria = self.get_sumulas(
-            event=event)
-        data = SumulaSerializer(
-            {'sumulas_classificatoria': sumulas_classificatoria, 'sumulas_imortal': sumulas_imortal}).data
+        data = self.get_serialized_sumulas(event=event)
         return response.Response(status=status.HTTP_200_OK, data=data)
 
     @swagger_auto_schema(
@@ -81,7 +81,7 @@ class SumulasView(BaseSumulaView):
             return handle_400_error(SUMULA_ID_NOT_PROVIDED_ERROR_MESSAGE)
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(self.request, event)
         sumula = SumulaImortal.objects.filter(id=sumula_id).first()
@@ -102,32 +102,7 @@ class SumulaClassificatoriaView(BaseSumulaView):
         operation_description="Cria uma nova sumula classificatoria e retorna a sumula criada com os jogadores e suas pontuações.",
         security=[{'Bearer': []}],
         manual_parameters=manual_parameter_event_id,
-        request_body=openapi.Schema(
-            title='Sumula',
-            type=openapi.TYPE_OBJECT,
-            properties={
-                'name': openapi.Schema(type=openapi.TYPE_STRING, description='Nome da sumula'),
-                'players': openapi.Schema(
-                    type=openapi.TYPE_ARRAY,
-                    title='Players',
-                    items=openapi.Schema(
-                        type=openapi.TYPE_OBJECT,
-                        properties={
-                            'id': openapi.Schema(type=openapi.TYPE_INTEGER, description='ID do jogador'),
-                            'name': openapi.Schema(type=openapi.TYPE_STRING, description='Nome do jogador'),
-                        }
-                    ),
-                    description='Lista de jogadores',
-                ),
-                'referees': openapi.Schema(
-                    type=openapi.TYPE_ARRAY, title='Staffs',
-                    items=openapi.Schema(
-                        type=openapi.TYPE_OBJECT,
-                        properties={'id': openapi.Schema(type=openapi.TYPE_INTEGER, description='ID do Staff')}),
-                    description='Lista de objetos Staff'),
-            },
-            required=['name', 'players'],
-        ),
+        request_body=sumula_classificatoria_api_post_schema,
         responses={201: openapi.Response(
             'Created', SumulaClassificatoriaSerializer), **Errors([400]).retrieve_erros()}
     )
@@ -136,29 +111,33 @@ class SumulaClassificatoriaView(BaseSumulaView):
 
         Permissões necessárias: IsAuthenticated, HasSumulaPermission
         """
-        if not self.validate_request_data_dict(request.data) or 'name' not in request.data or not self.validate_players(request.data):
+        data = request.data
+        if not self.validate_request_data_dict(data) or 'name' not in data or not self.validate_players(data):
             return handle_400_error("Dados inválidos!")
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(self.request, event)
-        name = request.data['name']
-        players = request.data['players']
-        sumula = SumulaClassificatoria.objects.create(event=event, name=name)
-        try:
-            players_score = self.create_players_score(
-                players=players, sumula=sumula, event=event)
-        except Exception as e:
-            return handle_400_error(str(e))
-        referees = request.data['referees']
-        self.add_referees(sumula=sumula, event=event, referees=referees)
-        try:
-            sumula.rounds = self.round_robin_tournament(
-                len(players_score), players_score)
-        except Exception as e:
-            return handle_400_error(str(e))
-        sumula.save()
+        name, players, referees = data['name'], data['players'], data.get('referees', [])
+        with transaction.atomic():
+            sumula = SumulaClassificatoria.objects.create(
+                event=event, name=name)
+            try:
+                players_score = self.create_players_score(
+                    players=players, sumula=sumula, event=event)
+            except ValidationError as e:
+                transaction.set_rollback(True)
+                return handle_400_error(str(e))
+            self.add_referees(sumula=sumula, event=event, referees=referees)
+            try:
+                sumula.rounds = self.round_robin_tournament(
+                    len(players_score), players_score)
+            except Exception as e:
+                transaction.set_rollback(True)
+                return handle_400_error(str(e))
+            sumula.save()
+        SumulaClassificatoriaSerializer.prefetch_instances([sumula])
         data = SumulaClassificatoriaSerializer(sumula).data
         return response.Response(status=status.HTTP_201_CREATED, data=data)
 
@@ -197,23 +176,23 @@ class SumulaClassificatoriaView(BaseSumulaView):
         - define a sumula como encerrada
         """
 
-        required_fields = ['id', 'name', 'description']
-        if not self.validate_request_data_dict(request.data) or not all(field in request.data for field in required_fields):
+        if not self.validate_request_data_dict(request.data) or not SUMULA_PUT_REQUIRED_FIELDS.issubset(request.data):
             return handle_400_error("Dados inválidos!")
         if not self.validate_players_score(request.data):
             return handle_400_error("Dados Invalidos!")
         sumula_id = request.data['id']
         if not sumula_id:
             return handle_400_error(SUMULA_ID_NOT_PROVIDED_ERROR_MESSAGE)
-        sumula = SumulaClassificatoria.objects.filter(id=sumula_id).first()
+        sumula = SumulaClassificatoria.objects.select_related(
+            'event').filter(id=sumula_id).first()
         if not sumula:
             return handle_400_error(SUMULA_NOT_FOUND_ERROR_MESSAGE)
         try:
-            event = self.get_event()
-        except Exception as e:
+            event = self.get_event(loaded_event=sumula.event)
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(request, event)
-        is_admin = request.user.email == event.admin_email
+        is_admin = event.is_admin_user(request.user)
         if not is_admin:
             try:
                 staff = self.validate_if_staff_is_sumula_referee(
@@ -247,31 +226,7 @@ class SumulaImortalView(BaseSumulaView):
         """,
         security=[{'Bearer': []}],
         manual_parameters=manual_parameter_event_id,
-        request_body=openapi.Schema(
-            title='Sumula',
-            type=openapi.TYPE_OBJECT,
-            properties={
-                'players': openapi.Schema(
-                    type=openapi.TYPE_ARRAY,
-                    title='Players',
-                    items=openapi.Schema(
-                        type=openapi.TYPE_OBJECT,
-                        properties={
-                            'id': openapi.Schema(type=openapi.TYPE_INTEGER, description='ID do jogador'),
-                            'name': openapi.Schema(type=openapi.TYPE_STRING, description='Nome do jogador'),
-                        }
-                    ),
-                    description='Lista de jogadores',
-                ),
-                'referees': openapi.Schema(
-                    type=openapi.TYPE_ARRAY, title='Staffs',
-                    items=openapi.Schema(
-                        type=openapi.TYPE_OBJECT,
-                        properties={'id': openapi.Schema(type=openapi.TYPE_INTEGER, description='ID do Staff')}),
-                    description='Lista de objetos Staff'),
-            },
-            required=['name', 'players'],
-        ),
+        request_body=sumula_imortal_api_post_schema,
         responses={201: openapi.Response(
             'Created', SumulaImortalSerializer), **Errors([400]).retrieve_erros()}
     )
@@ -280,31 +235,34 @@ class SumulaImortalView(BaseSumulaView):
 
         Permissões necessárias: IsAuthenticated, HasSumulaPermission
         """
-        required_fields = ['players', 'referees']
-        if not self.validate_request_data_dict(request.data) or not all(field in request.data for field in required_fields) or not self.validate_players(request.data):
+        data = request.data
+        if not self.validate_request_data_dict(data) or not SUMULA_IMORTAL_POST_REQUIRED_FIELDS.issubset(data) or not self.validate_players(data):
             return handle_400_error("Dados inválidos!")
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(self.request, event)
 
-        players = request.data['players']
-        sumula = SumulaImortal.objects.create(
-            event=event)
-        try:
-            players_score = self.create_players_score(
-                players=players, sumula=sumula, event=event)
-        except Exception as e:
-            return handle_400_error(str(e))
-        referees = request.data['referees']
-        self.add_referees(sumula=sumula, event=event, referees=referees)
-        try:
-            sumula.rounds = self.round_robin_tournament(
-                len(players_score), players_score)
-        except Exception as e:
-            return handle_400_error(str(e))
-        sumula.save()
+        players, referees = data['players'], data['referees']
+        with transaction.atomic():
+            sumula = SumulaImortal.objects.create(
+                event=event)
+            try:
+                players_score = self.create_players_score(
+                    players=players, sumula=sumula, event=event)
+            except ValidationError as e:
+                transaction.set_rollback(True)
+                return handle_400_error(str(e))
+            self.add_referees(sumula=sumula, event=event, referees=referees)
+            try:
+                sumula.rounds = self.round_robin_tournament(
+                    len(players_score), players_score)
+            except Exception as e:
+                transaction.set_rollback(True)
+                return handle_400_error(str(e))
+            sumula.save()
+        SumulaImortalSerializer.prefetch_instances([sumula])
         data = SumulaImortalSerializer(sumula).data
         return response.Response(status=status.HTTP_201_CREATED, data=data)
 
@@ -333,21 +291,21 @@ class SumulaImortalView(BaseSumulaView):
         Obtém uma lista da pontuação dos jogadores e atualiza as pontuações associados a sumula.
         Marca a sumula como encerrada.
         """
-        required_fields = ['id', 'name', 'description']
-        if not self.validate_request_data_dict(request.data) or not all(field in request.data for field in required_fields):
+        if not self.validate_request_data_dict(request.data) or not SUMULA_PUT_REQUIRED_FIELDS.issubset(request.data):
             return handle_400_error("Dados inválidos!")
         sumula_id = request.data['id']
         if not sumula_id:
             return handle_400_error(SUMULA_ID_NOT_PROVIDED_ERROR_MESSAGE)
-        sumula = SumulaImortal.objects.filter(id=sumula_id).first()
+        sumula = SumulaImortal.objects.select_related(
+            'event').filter(id=sumula_id).first()
         if not sumula:
             return handle_400_error(SUMULA_NOT_FOUND_ERROR_MESSAGE)
         try:
-            event = self.get_event()
-        except Exception as e:
+            event = self.get_event(loaded_event=sumula.event)
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(request, event)
-        is_admin = request.user.email == event.admin_email
+        is_admin = event.is_admin_user(request.user)
         if not is_admin:
             try:
                 staff = self.validate_if_staff_is_sumula_referee(
@@ -379,13 +337,10 @@ class ActiveSumulaView(BaseSumulaView):
         """Retorna todas as sumulas ativas."""
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(self.request, event)
-        sumula_imortal, sumula_classificatoria = self.get_sumulas(
-            event=event, active=True)
-        data = SumulaSerializer(
-            {'sumulas_classificatoria': sumula_classificatoria, 'sumulas_imortal': sumula_imortal}).data
+        data = self.get_serialized_sumulas(event=event, active=True)
         return response.Response(status=status.HTTP_200_OK, data=data)
 
 
@@ -404,20 +359,17 @@ class FinishedSumulaView(BaseSumulaView):
         """Retorna todas as sumulas encerradas."""
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(self.request, event)
-        sumula_imortal, sumula_classificatoria = self.get_sumulas(
-            event=event, active=False)
-        data = SumulaSerializer(
-            {'sumulas_classificatoria': sumula_classificatoria, 'sumulas_imortal': sumula_imortal}).data
+        data = self.get_serialized_sumulas(event=event, active=False)
         return response.Response(status=status.HTTP_200_OK, data=data)
 
 
 class GetSumulaForPlayerPermission(BasePermission):
     def has_object_permission(self, request, view, obj) -> bool:
         if request.method == 'GET':
-            return request.user.has_perm('api.view_event', obj)
+            return has_event_perm(request, 'api.view_event', obj)
         return False
 
 
@@ -437,7 +389,7 @@ class GetSumulaForPlayer(BaseSumulaView):
         """Retorna todas as sumulas ativas associadas a um jogador."""
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(self.request, event)
 
@@ -446,21 +398,17 @@ class GetSumulaForPlayer(BaseSumulaView):
             return handle_400_error("Jogador não encontrado!")
 
         if player.is_imortal:
-            player_scores = PlayerScore.objects.filter(
-                player=player, sumula_imortal__active=True)
-            if not player_scores:
+            sumulas = SumulaImortalForPlayerSerializer.prefetch_queryset(SumulaImortal.objects.filter(
+                active=True, id__in=player.scores.values('sumula_imortal')).order_by('name'))
+            if not sumulas:
                 return handle_400_error("Jogador não possui nenhuma sumula associada!")
-            sumulas = [
-                player_score.sumula_imortal for player_score in player_scores]
             data = SumulaImortalForPlayerSerializer(
                 sumulas, many=True).data
         else:
-            player_scores = PlayerScore.objects.filter(
-                player=player, sumula_classificatoria__active=True)
-            if not player_scores:
+            sumulas = SumulaClassificatoriaForPlayerSerializer.prefetch_queryset(SumulaClassificatoria.objects.filter(
+                active=True, id__in=player.scores.values('sumula_classificatoria')).order_by('name'))
+            if not sumulas:
                 return handle_400_error("Jogador não possui nenhuma sumula associada!")
-            sumulas = [
-                player_score.sumula_classificatoria for player_score in player_scores]
             data = SumulaClassificatoriaForPlayerSerializer(
                 sumulas, many=True).data
 
@@ -500,10 +448,10 @@ class AddRefereeToSumulaView(BaseSumulaView):
             return handle_400_error(SUMULA_ID_NOT_PROVIDED_ERROR_MESSAGE)
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(self.request, event)
-        if event.admin_email == request.user.email:
+        if event.is_admin_user(request.user):
             return response.Response(status=status.HTTP_200_OK)
 
         staff = Staff.objects.filter(
@@ -519,9 +467,10 @@ class AddRefereeToSumulaView(BaseSumulaView):
         if not sumula:
             return handle_400_error(SUMULA_NOT_FOUND_ERROR_MESSAGE)
 
-        if sumula.referee.all().count() > 0 and staff not in sumula.referee.all():
+        referees = list(sumula.referee.all())
+        if referees and staff not in referees:
             return handle_400_error("Súmula já possui um ou mais árbitros!")
-        elif sumula.referee.all().count() == 0:
+        elif not referees:
             sumula.referee.add(staff)
         return response.Response(status=status.HTTP_200_OK)
 
@@ -545,7 +494,7 @@ class GenerateSumulas(BaseSumulaView):
     def post(self, request: request.Request, *args, **kwargs) -> response.Response:
         try:
             event = self.get_event()
-        except Exception as e:
+        except ValidationError as e:
             return handle_400_error(str(e))
         self.check_object_permissions(self.request, event)
         if event.is_sumulas_generated:
@@ -572,13 +521,12 @@ class GenerateSumulas(BaseSumulaView):
 
         try:
             with transaction.atomic():
-                players = Player.objects.filter(
-                    event=event, is_present=True, is_imortal=False).select_for_update()
-                if players.count() < MIN_PLAYERS:
+                players = list(Player.objects.filter(
+                    event=event, is_present=True, is_imortal=False).select_for_update())
+                if len(players) < MIN_PLAYERS:
                     logger.error(f"O evento precisa de pelo menos {MIN_PLAYERS} jogadores presentes para iniciar.")
                     raise ValidationError(f"O evento precisa de pelo menos {MIN_PLAYERS} jogadores presentes para iniciar.")
 
-                players = list(players)
                 random.shuffle(players)
                 N = len(players)
                 resto = N % MAX_PLAYERS
@@ -622,8 +570,12 @@ class GenerateSumulas(BaseSumulaView):
                                 break
                         index_of_complete_sumulas -= 1
 
+                # Carrega as pontuações (com jogadores) de todas as sumulas geradas em uma única consulta
+                prefetch_related_objects(sumulas, Prefetch(
+                    'scores', queryset=PlayerScore.objects.select_related('player').order_by('id')))
+
                 for sumula in sumulas:
-                    players_list = [player for player in sumula.scores.all()]
+                    players_list = list(sumula.scores.all())
                     sumula.rounds = self.round_robin_tournament(
                         n=len(players_list), players_score=players_list)
                     sumula.save()
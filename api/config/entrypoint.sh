@@ -10,6 +10,7 @@ echo 'PostgreSQL iniciado'
 
 echo 'Migrando banco de dados...'
 python3 manage.py migrate
+python3 manage.py createcachetable
 
 echo 'Criando usuário admin...'
 python3 manage.py initadmin
@@ -98,6 +98,19 @@ WSGI_APPLICATION = 'core.wsgi.application'
 } """
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Database cache so every gunicorn worker sees the same entries and invalidations.
+# The table is created with `manage.py createcachetable`.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -56,9 +56,14 @@ class UserAdmin(AuthUserAdmin):
     list_display = ['id', 'uuid', 'email', 'username',
                     'first_name', 'last_name', 'is_active', 'group', 'event']
     search_fields = ['email']
+    list_per_page = 50
     filter_horizontal = ('groups', 'events')
     filter_horizontal = ('groups', 'events')
 
+    def get_queryset(self, request):
+        # Grupos e eventos exibidos na listagem são carregados em duas consultas, e não uma por usuário
+        return super().get_queryset(request).prefetch_related('groups', 'events')
+
     add_fieldsets = (
         (None, {
             'classes': ('wide',),
@@ -9,7 +9,9 @@ args = parser.parse_args()
 try:
     command = "sudo docker exec api-django python config/excel.py".split()
     subprocess.run(command)
-    command = "sudo docker exec api-django coverage run manage.py test".split()
+    command = "sudo docker exec api-django coverage run manage.py test --parallel auto".split()
+    subprocess.run(command)
+    command = "sudo docker exec api-django coverage combine".split()
     subprocess.run(command)
     command = "sudo docker exec api-django coverage report -m".split()
     subprocess.run(command)